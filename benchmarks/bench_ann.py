@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+import numpy as np
+from recommendation.index import RecommenderIndex
+from recommendation.ann import LSHIndex, recall_report, choose_probes, DEFAULT_TABLES, DEFAULT_MIN_RECALL
+from recommendation.script import charger_donnees_films
+from recommendation.build_index import CSV_URL
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rappel et latence de l'index LSH face à la recherche exacte")
+    parser.add_argument('--data', default=CSV_URL, help="Chemin ou URL du CSV nettoyé")
+    parser.add_argument('--tables', type=int, default=DEFAULT_TABLES)
+    parser.add_argument('--bits', type=int, default=None)
+    parser.add_argument('--probes', type=int, nargs='+', default=[0, 1, 2, 4, 8])
+    parser.add_argument('--sample', type=int, default=200, help="Nombre de films de référence")
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--min-recall', type=float, default=DEFAULT_MIN_RECALL, help="Rappel minimal visé par le calibrage")
+    args = parser.parse_args()
+
+    movies_df = charger_donnees_films(args.data)
+    index = RecommenderIndex.build(movies_df)
+
+    start = time.perf_counter()
+    lsh = LSHIndex(index, n_tables=args.tables, n_bits=args.bits)
+    print(f"{len(index)} films, {lsh.n_tables} tables x {lsh.n_bits} bits, construit en {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(0)
+    positions = rng.choice(len(index), size=min(args.sample, len(index)), replace=False)
+
+    print(f"{'probes':>6} | {'rappel@' + str(args.k):>9} | {'candidats':>9} | {'LSH':>9} | {'exact':>9}")
+    report = recall_report(index, lsh, positions, k=args.k, probes=args.probes)
+    for row in report:
+        print(
+            f"{row['n_probes']:>6} | {row['recall']:>9.3f} | {row['candidates']:>9.0f}"
+            f" | {row['ann_ms']:>7.2f}ms | {row['exact_ms']:>7.2f}ms"
+        )
+
+    n_probes = choose_probes(report, args.min_recall)
+    if n_probes is None:
+        print(f"Aucun réglage n'atteint un rappel de {args.min_recall:g} plus vite que la recherche exacte : LSH non utilisé")
+    else:
+        print(f"n_probes retenu pour un rappel de {args.min_recall:g} : {n_probes}")
+
+
+if __name__ == "__main__":
+    main()
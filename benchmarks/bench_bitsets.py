@@ -0,0 +1,64 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import TfidfVectorizer
+from recommendation.bitsets import MultiHotBitset
+from recommendation.index import TOKEN_PATTERN, process_feature
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary', 'Drama', 'Family',
+    'Fantasy', 'History', 'Horror', 'Music', 'Mystery', 'Romance', 'Science Fiction',
+    'TV Movie', 'Thriller', 'War', 'Western'
+]
+
+
+def synthetic_genres(n_movies, seed=0):
+    """Listes de 1 à 4 genres tirées au hasard"""
+    rng = np.random.default_rng(seed)
+    sizes = rng.integers(1, 5, n_movies)
+    return pd.Series([list(rng.choice(GENRES, size, replace=False)) for size in sizes])
+
+
+def bench(n_movies, repeat, seed=0):
+    """Compare la similarité des genres en TF-IDF creux et en Jaccard sur bitsets"""
+    genres = synthetic_genres(n_movies, seed)
+    matrix = TfidfVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.float32).fit_transform(genres.apply(process_feature))
+    bitset = MultiHotBitset.from_lists(genres)
+    position = n_movies // 2
+
+    def tfidf():
+        return matrix.dot(matrix[position].toarray().ravel())
+
+    timings = {
+        'tfidf': tfidf,
+        'jaccard': lambda: bitset.jaccard(position),
+    }
+    results = {name: min(timeit.repeat(func, number=1, repeat=repeat)) * 1000 for name, func in timings.items()}
+    results['tfidf_mb'] = (matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes) / 1e6
+    results['bitset_mb'] = bitset.bits.nbytes / 1e6
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark des genres en bitsets uint64")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 50_000, 500_000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'N films':>10} | {'TF-IDF':>10} | {'Jaccard':>10} | {'gain':>6} | {'TF-IDF Mo':>9} | {'bitset Mo':>9}")
+    for n_movies in args.sizes:
+        results = bench(n_movies, args.repeat)
+        gain = results['tfidf'] / results['jaccard']
+        print(
+            f"{n_movies:>10} | {results['tfidf']:>8.3f}ms | {results['jaccard']:>8.3f}ms | {gain:>5.1f}x"
+            f" | {results['tfidf_mb']:>9.2f} | {results['bitset_mb']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
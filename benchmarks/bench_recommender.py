@@ -0,0 +1,207 @@
+import sys
+import os
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, 'streamlit_home'))
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+GENRES = [
+    'Action', 'Adventure', 'Animation', 'Comedy', 'Crime', 'Documentary', 'Drama', 'Family',
+    'Fantasy', 'History', 'Horror', 'Music', 'Mystery', 'Romance', 'Science Fiction',
+    'TV Movie', 'Thriller', 'War', 'Western'
+]
+SYLLABLES = ['ka', 'lo', 'mi', 'ra', 'ten', 'vo', 'shi', 'an', 'del', 'ro', 'ma', 'nu', 'ber', 'is', 'ta', 'go']
+COUNTRIES = ['France', 'United States of America', 'United Kingdom', 'Germany', 'Japan', 'Italy', 'Spain', 'Canada']
+LANGUAGES = ['Français', 'English', 'Deutsch', '日本語', 'Italiano', 'Español']
+DECADES = ['1950s', '1960s', '1970s', '1980s', '1990s', '2000s', '2010s', '2020s']
+
+
+def make_words(n_words, rng, n_syllables=(2, 4)):
+    """Vocabulaire synthétique de mots construits à partir de syllabes"""
+    words = set()
+    while len(words) < n_words:
+        length = rng.integers(*n_syllables, endpoint=True)
+        words.add(''.join(rng.choice(SYLLABLES, length)))
+    return np.array(sorted(words))
+
+
+def join_lists(vocabulary, n_movies, sizes, rng, zipf=None):
+    """Une chaîne 'a, b, c' par film, avec sizes[i] éléments tirés du vocabulaire"""
+    if zipf:
+        codes = (rng.zipf(zipf, sizes.sum()) - 1) % len(vocabulary)
+    else:
+        codes = rng.integers(len(vocabulary), size=sizes.sum())
+    rows = np.repeat(np.arange(n_movies), sizes)
+    joined = pd.Series(vocabulary[codes]).groupby(rows).agg(', '.join)
+    return joined.reindex(range(n_movies), fill_value='').to_numpy()
+
+
+def synthetic_catalog(n_movies, seed=0):
+    """
+    Catalogue synthétique au format de df_movie_cleaned.csv (colonnes d'origine).
+
+    Genres, mots-clés, acteurs avec rôles, synopsis et dates de sortie suivent
+    des distributions proches du catalogue réel (mots-clés et synopsis en loi de Zipf).
+    """
+    rng = np.random.default_rng(seed)
+    words = make_words(5_000, rng)
+    first_names = make_words(400, rng, (2, 3))
+    last_names = make_words(2_000, rng, (2, 4))
+    people = np.char.add(np.char.add(np.char.capitalize(rng.choice(first_names, 20_000)), ' '),
+                         np.char.capitalize(rng.choice(last_names, 20_000)))
+    roles = np.char.capitalize(make_words(3_000, rng, (2, 3)))
+    cast = np.char.add(np.char.add(np.char.add(people, ' ('), rng.choice(roles, len(people))), ')')
+
+    titles = np.char.add(np.char.add(np.char.capitalize(rng.choice(words, n_movies)), ' '), np.arange(n_movies).astype(str))
+    days = rng.integers(np.datetime64('1920-01-01').astype(int), np.datetime64('2024-12-31').astype(int), n_movies)
+    runtime = rng.normal(105, 20, n_movies).clip(60, 240).round()
+
+    return pd.DataFrame({
+        'Titre Original': titles,
+        'Titre Français': np.char.add('Le ', titles),
+        'Synopsis': join_lists(words, n_movies, rng.integers(20, 60, n_movies), rng, zipf=1.3).astype(object),
+        'Date de Sortie': np.datetime_as_string(days.astype('datetime64[D]')),
+        'Réalisateur(s)': rng.choice(people[:max(n_movies // 5, 1)], n_movies),
+        'Affiche': [f"/poster_{i}.jpg" for i in range(n_movies)],
+        'Genres': join_lists(np.array(GENRES), n_movies, rng.integers(1, 5, n_movies), rng),
+        'Acteurs': join_lists(cast, n_movies, rng.integers(3, 11, n_movies), rng, zipf=1.2),
+        'Pays de Production': join_lists(np.array(COUNTRIES), n_movies, rng.integers(1, 3, n_movies), rng),
+        'Langues Parlées': join_lists(np.array(LANGUAGES), n_movies, rng.integers(1, 3, n_movies), rng),
+        'Mots-Clés': join_lists(words, n_movies, rng.integers(3, 15, n_movies), rng, zipf=1.5),
+        'Compagnies de Production': join_lists(last_names, n_movies, rng.integers(1, 4, n_movies), rng),
+        'Box Office': rng.lognormal(17, 1.5, n_movies).round(),
+        'Budget': rng.lognormal(16, 1.2, n_movies).round(),
+        'Durée': runtime,
+        'Note imdb': rng.normal(6.5, 1, n_movies).clip(1, 10).round(1),
+        'Note tmdb': rng.normal(6.5, 1, n_movies).clip(1, 10).round(1),
+        'Votes imdb': rng.integers(100, 2_000_000, n_movies),
+        'Votes tmdb': rng.integers(10, 30_000, n_movies),
+        'ID imdb': [f"tt{i:07d}" for i in range(n_movies)],
+        'ID tmdb': np.arange(1, n_movies + 1),
+        'Réputation': rng.lognormal(2, 1, n_movies).round(3),
+        'Décennie': rng.choice(DECADES, n_movies)
+    })
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus en Mo (None si indisponible)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss est en octets sous macOS, en kilo-octets sous Linux
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3
+
+
+def measure(func, repeat, setup=None):
+    """Latences (ms) de repeat appels à func, setup étant appelé avant chacun"""
+    timings = []
+    for i in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def affiche_page(catalog, k):
+    """Chargement de la page A l'affiche : colonnes de tri, puis lignes complètes des k premiers films"""
+    from config import AFFICHE_COLUMNS
+    top = catalog.frame(AFFICHE_COLUMNS).sort_values('average_rating', ascending=False).head(k)
+    return catalog.rows(top.index)
+
+
+def run_size(n_movies, repeat, k, seed):
+    """Mesure toutes les opérations sur un catalogue de n_movies films (dans un processus dédié)"""
+    # Hors de `streamlit run`, Streamlit signale le mode "bare" à chaque appel mis en cache
+    import streamlit.logger
+    streamlit.logger.set_log_level('error')
+    import util
+    from recommendation.selection import select_top_k
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'df_movie_cleaned.csv')
+        synthetic_catalog(n_movies, seed).to_csv(csv_path, index=False)
+        # Instantané et index dans le dossier temporaire : ceux de l'application ne sont pas touchés
+        util.RECOMMENDER_INDEX_DIR = os.path.join(directory, 'recommender_index')
+        util.SNAPSHOT_DIR = os.path.join(directory, 'snapshot')
+
+        # Catalogue neuf à chaque mesure : lecture des colonnes depuis l'instantané,
+        # construit une fois avant les mesures
+        load_catalog = getattr(util.load_catalog, '__wrapped__', util.load_catalog)
+        load_catalog(csv_path)
+        results['load_movie_data'] = measure(lambda i: load_catalog(csv_path).frame(), max(1, repeat // 10))
+        results["page A l'affiche"] = measure(
+            lambda i: affiche_page(load_catalog(csv_path), k), max(1, repeat // 10)
+        )
+        movies_df = util.load_movie_data(csv_path)
+
+        start = time.perf_counter()
+        index = util.get_recommender_index(movies_df, util.catalog_key(movies_df))
+        results['construction index'] = np.array([(time.perf_counter() - start) * 1000])
+
+        rng = np.random.default_rng(seed)
+        titles = movies_df['title'].to_numpy()[rng.integers(n_movies, size=repeat)]
+        cache = util.get_recommendation_cache()
+
+        def clear_caches():
+            cache.clear()
+            util.get_component_cache().clear()
+
+        results['recommend_movies froid'] = measure(
+            lambda i: util.recommend_movies(titles[i], movies_df, k), repeat, setup=clear_caches
+        )
+        for title in titles:
+            util.recommend_movies(title, movies_df, k)
+        results['recommend_movies chaud'] = measure(lambda i: util.recommend_movies(titles[i], movies_df, k), repeat)
+
+        filters = util.get_catalog_filters(movies_df, util.catalog_key(movies_df))
+        genres = [['Drama'], ['Comedy', 'Romance'], ['Science Fiction', 'Action', 'Thriller']]
+        results['filtrage'] = measure(
+            lambda i: filters.mask(genres[i % len(genres)], note_min=6, duree_max=120), repeat
+        )
+
+        scores = index.similarities(int(rng.integers(n_movies)))
+        results['top-k'] = measure(lambda i: select_top_k(scores, k, exclude=i), repeat)
+
+    return {
+        'timings': {name: np.percentile(values, [50, 95, 99]).tolist() for name, values in results.items()},
+        'peak_rss_mb': peak_rss_mb()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du système de recommandation sur des catalogues synthétiques")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 50_000, 500_000])
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=50, help="Nombre de requêtes mesurées par opération")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Un processus neuf par taille : le pic de mémoire mesuré est celui de ce catalogue seul
+    context = multiprocessing.get_context('spawn')
+    for n_movies in args.sizes:
+        with context.Pool(1) as pool:
+            report = pool.apply(run_size, (n_movies, args.repeat, args.k, args.seed))
+
+        peak = report['peak_rss_mb']
+        print(f"\n{n_movies} films" + (f" — pic RSS {peak:.0f} Mo" if peak is not None else ""))
+        print(f"{'opération':>24} | {'p50':>10} | {'p95':>10} | {'p99':>10}")
+        for name, (p50, p95, p99) in report['timings'].items():
+            print(f"{name:>24} | {p50:>8.2f}ms | {p95:>8.2f}ms | {p99:>8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
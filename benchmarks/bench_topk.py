@@ -0,0 +1,57 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import timeit
+import numpy as np
+from recommendation.selection import select_top_k
+
+
+def argsort_top_k(scores, k):
+    """Ancienne sélection : tri complet du catalogue en O(N log N)"""
+    return scores.argsort()[::-1][1:k+1]
+
+
+def bench(n_movies, k, repeat, seed=0):
+    """Mesure la sélection top-k par tri complet et par argpartition sur N films"""
+    rng = np.random.default_rng(seed)
+    scores = rng.random(n_movies)
+    reference = int(rng.integers(n_movies))
+    scores[reference] = scores.max() + 1
+    mask = rng.random(n_movies) < 0.3
+
+    timings = {
+        'argsort': lambda: argsort_top_k(scores, k),
+        'argpartition': lambda: select_top_k(scores, k, exclude=reference),
+        'argpartition + masque': lambda: select_top_k(scores, k, exclude=reference, mask=mask),
+    }
+    results = {}
+    for name, func in timings.items():
+        results[name] = min(timeit.repeat(func, number=1, repeat=repeat)) * 1000
+
+    # Les deux sélections doivent renvoyer les mêmes films
+    positions, _ = select_top_k(scores, k, exclude=reference)
+    assert np.array_equal(positions, argsort_top_k(scores, k))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark de la sélection top-k")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[5_000, 50_000, 500_000])
+    parser.add_argument('-k', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'N films':>10} | {'argsort':>10} | {'argpartition':>12} | {'+ masque':>10} | {'gain':>6}")
+    for n_movies in args.sizes:
+        results = bench(n_movies, args.k, args.repeat)
+        gain = results['argsort'] / results['argpartition']
+        print(
+            f"{n_movies:>10} | {results['argsort']:>8.3f}ms | {results['argpartition']:>10.3f}ms"
+            f" | {results['argpartition + masque']:>8.3f}ms | {gain:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
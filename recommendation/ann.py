@@ -0,0 +1,183 @@
+import time
+import numpy as np
+
+from recommendation.selection import select_top_k
+
+DEFAULT_TABLES = 8
+DEFAULT_PROBES = 2
+
+# Calibrage de n_probes : rappel@10 minimal et taille de l'échantillon de films mesurés
+DEFAULT_MIN_RECALL = 0.9
+CALIBRATION_SAMPLE = 100
+CALIBRATION_PROBES = (0, 1, 2, 4, 8)
+
+# Taille moyenne visée pour un seau lorsque n_bits n'est pas fixé
+TARGET_BUCKET_SIZE = 256
+
+
+def default_bits(n_movies):
+    """Nombre de bits tel qu'un seau contienne environ TARGET_BUCKET_SIZE films"""
+    return int(np.clip(np.round(np.log2(max(n_movies, 1) / TARGET_BUCKET_SIZE)), 4, 62))
+
+
+class LSHIndex:
+    """
+    Index de plus proches voisins approchés par projections aléatoires (LSH).
+
+    Chaque film est haché dans n_tables tables par le signe de n_bits projections
+    aléatoires de ses critères pondérés. Une requête collecte les films des seaux
+    du film de référence (et de n_probes seaux voisins par table), puis les
+    re-classe avec la similarité exacte de l'index. n_tables, n_bits et n_probes
+    règlent le compromis rappel / latence (voir calibrate).
+    """
+
+    def __init__(self, index, n_tables=DEFAULT_TABLES, n_bits=None, n_probes=DEFAULT_PROBES, seed=0):
+        n_bits = n_bits or default_bits(len(index))
+        if n_bits > 62:
+            raise ValueError("n_bits doit être inférieur ou égal à 62")
+        self.index = index
+        self.n_tables = n_tables
+        self.n_bits = n_bits
+        self.n_probes = n_probes
+
+        features = index.weighted_features()
+        rng = np.random.default_rng(seed)
+        self.features = features
+        self.projections = rng.standard_normal((features.shape[1], n_tables * n_bits)).astype(np.float32)
+        self._bit_values = np.left_shift(np.int64(1), np.arange(n_bits, dtype=np.int64))
+
+        codes = self._codes(features @ self.projections)
+        self.sorted_codes = np.empty_like(codes)
+        self.order = np.empty(codes.shape, dtype=np.int32)
+        for table in range(n_tables):
+            order = np.argsort(codes[:, table], kind='stable')
+            self.order[:, table] = order
+            self.sorted_codes[:, table] = codes[order, table]
+
+    def __len__(self):
+        return self.order.shape[0]
+
+    def _codes(self, projected):
+        """Code entier de chaque table à partir des projections (n x n_tables*n_bits)"""
+        bits = (np.asarray(projected) > 0).reshape(-1, self.n_tables, self.n_bits)
+        return bits.astype(np.int64) @ self._bit_values
+
+    def _probe_codes(self, projected, n_probes):
+        """
+        Codes à visiter pour chaque table : le seau du film et ses n_probes voisins.
+
+        Les bits inversés en priorité sont ceux dont la projection est la plus
+        proche de zéro, c'est-à-dire les plus incertains.
+        """
+        projected = np.asarray(projected).reshape(self.n_tables, self.n_bits)
+        codes = self._codes(projected.reshape(1, -1))[0]
+        n_probes = min(n_probes, self.n_bits)
+        flipped = np.argsort(np.abs(projected), axis=1)[:, :n_probes]
+        probes = codes[:, None] ^ self._bit_values[flipped]
+        return np.concatenate([codes[:, None], probes], axis=1)
+
+    def candidates(self, vector, n_probes=None):
+        """Positions des films partageant un seau avec le vecteur requête"""
+        n_probes = self.n_probes if n_probes is None else n_probes
+        probe_codes = self._probe_codes(vector @ self.projections, n_probes)
+
+        found = []
+        for table in range(self.n_tables):
+            column = self.sorted_codes[:, table]
+            starts = np.searchsorted(column, probe_codes[table], side='left')
+            stops = np.searchsorted(column, probe_codes[table], side='right')
+            for start, stop in zip(starts, stops):
+                if stop > start:
+                    found.append(self.order[start:stop, table])
+
+        if not found:
+            return np.empty(0, dtype=np.int32)
+        return np.unique(np.concatenate(found))
+
+    def query(self, position, k=5, n_probes=None, mask=None):
+        """
+        Renvoie les k films approximativement les plus similaires à un film.
+
+        Args:
+            n_probes (int, optional): Seaux voisins visités par table (self.n_probes par défaut)
+            mask (np.ndarray, optional): Masque booléen des films candidats
+
+        Returns:
+            tuple: Positions et scores exacts des films retenus, triés par score décroissant
+        """
+        candidates = self.candidates(self.features[position], n_probes)
+        candidates = candidates[candidates != position]
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        scores = self.index.similarities_for(position, candidates)
+        top, top_scores = select_top_k(scores, k)
+        return candidates[top], top_scores
+
+
+def recall_report(index, lsh, positions, k=10, probes=(0, 1, 2, 4, 8)):
+    """
+    Compare l'index LSH à la recherche exacte sur un échantillon de films.
+
+    Args:
+        index (RecommenderIndex): Index exact de référence
+        lsh (LSHIndex): Index approché évalué
+        positions (array): Films de référence de l'échantillon
+        k (int): Nombre de recommandations comparées
+        probes (tuple): Valeurs de n_probes à évaluer
+
+    Returns:
+        list: Un dict par valeur de n_probes (rappel moyen, latences moyennes, candidats)
+    """
+    exact = {}
+    exact_time = 0.0
+    for position in positions:
+        start = time.perf_counter()
+        top, _ = select_top_k(index.similarities(position), k, exclude=position)
+        exact_time += time.perf_counter() - start
+        exact[position] = set(top.tolist())
+
+    report = []
+    for n_probes in probes:
+        recalls = []
+        n_candidates = []
+        ann_time = 0.0
+        for position in positions:
+            start = time.perf_counter()
+            top, _ = lsh.query(position, k, n_probes=n_probes)
+            ann_time += time.perf_counter() - start
+            recalls.append(len(exact[position] & set(top.tolist())) / max(len(exact[position]), 1))
+            n_candidates.append(len(lsh.candidates(lsh.features[position], n_probes)))
+
+        report.append({
+            'n_probes': n_probes,
+            'recall': float(np.mean(recalls)),
+            'ann_ms': ann_time / len(positions) * 1000,
+            'exact_ms': exact_time / len(positions) * 1000,
+            'candidates': float(np.mean(n_candidates))
+        })
+    return report
+
+
+
+def choose_probes(report, min_recall=DEFAULT_MIN_RECALL):
+    """
+    Plus petite valeur de n_probes d'un recall_report dont le rappel atteint
+    min_recall tout en restant plus rapide que la recherche exacte (None sinon).
+    """
+    for row in sorted(report, key=lambda row: row['n_probes']):
+        if row['recall'] >= min_recall and row['ann_ms'] < row['exact_ms']:
+            return row['n_probes']
+    return None
+
+
+def calibrate(index, lsh, k=10, min_recall=DEFAULT_MIN_RECALL, sample=CALIBRATION_SAMPLE, probes=CALIBRATION_PROBES, seed=0):
+    """
+    Choisit n_probes d'après recall_report sur un échantillon de films du catalogue.
+
+    Returns:
+        int: Valeur retenue par choose_probes, ou None si aucune ne convient
+        (la recherche exacte est alors préférable)
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.choice(len(index), size=min(sample, len(index)), replace=False)
+    return choose_probes(recall_report(index, lsh, positions, k=k, probes=probes), min_recall)
@@ -0,0 +1,101 @@
+import numpy as np
+
+from recommendation.catalog import ListColumn
+
+WORD_BITS = 64
+
+# Nombre de bits à 1 de chaque octet, pour les versions de NumPy sans bitwise_count
+_BYTE_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+
+def popcount(words):
+    """Nombre de bits à 1 de chaque mot uint64"""
+    words = np.asarray(words, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    counts = _BYTE_POPCOUNT[words.view(np.uint8)]
+    return counts.reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+
+class MultiHotBitset:
+    """
+    Encodage multi-hot compact d'une colonne de listes (genres, mots-clés...).
+
+    Chaque film est une ligne de n_words mots uint64 où le bit i indique la
+    présence de l'étiquette i. Les étiquettes sont gardées entières (« Science
+    Fiction » est un seul genre). Le recouvrement avec un film se calcule sur
+    tout le catalogue par un ET binaire suivi d'un popcount.
+
+    Au-delà de max_bits étiquettes distinctes (mots-clés d'un grand catalogue),
+    plusieurs étiquettes partagent un même bit : les intersections sont alors
+    légèrement surestimées, en échange d'une taille fixe par film.
+    """
+
+    def __init__(self, vocabulary, bits, n_bits):
+        self.vocabulary = vocabulary
+        self.bits = bits
+        self.n_bits = n_bits
+        self.counts = popcount(bits).sum(axis=1, dtype=np.int32)
+
+    def __len__(self):
+        return self.bits.shape[0]
+
+    @classmethod
+    def from_lists(cls, values, max_bits=None):
+        """
+        Encode une série de listes d'étiquettes.
+
+        Args:
+            values (pd.Series): Listes d'étiquettes, au format compact ou en listes Python
+                (toute autre valeur compte comme une liste vide)
+            max_bits (int, optional): Nombre maximal de bits par film
+        """
+        column = ListColumn.from_series(values)
+        # Codes renumérotés dans l'ordre des étiquettes : le repliement reste déterministe
+        ranks = np.empty(len(column.vocabulary), dtype=np.int64)
+        ranks[np.argsort(column.vocabulary, kind='stable')] = np.arange(len(column.vocabulary))
+
+        n_bits = len(ranks) if max_bits is None else min(len(ranks), max_bits)
+        n_bits = max(n_bits, 1)
+        n_words = -(-n_bits // WORD_BITS)
+        vocabulary = dict(zip(column.vocabulary.tolist(), (ranks % n_bits).tolist()))
+
+        rows = np.repeat(np.arange(len(column)), column.lengths())
+        codes = ranks[column.codes] % n_bits
+        bits = np.zeros((len(column), n_words), dtype=np.uint64)
+        # bitwise_or.at cumule correctement plusieurs étiquettes dans un même mot
+        np.bitwise_or.at(
+            bits,
+            (rows, codes // WORD_BITS),
+            np.left_shift(np.uint64(1), (codes % WORD_BITS).astype(np.uint64))
+        )
+        return cls(vocabulary, bits, n_bits)
+
+    def encode(self, labels):
+        """Bitset d'une liste d'étiquettes (les étiquettes inconnues sont ignorées)"""
+        query = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        for label in labels:
+            code = self.vocabulary.get(label)
+            if code is not None:
+                query[code // WORD_BITS] |= np.uint64(1) << np.uint64(code % WORD_BITS)
+        return query
+
+    def intersections(self, query):
+        """Nombre d'étiquettes communes entre un bitset et chaque film du catalogue"""
+        return popcount(self.bits & query).sum(axis=1, dtype=np.int32)
+
+    def jaccard(self, position):
+        """Indice de Jaccard |A ∩ B| / |A ∪ B| entre un film et tout le catalogue (0 si les deux listes sont vides)"""
+        inter = self.intersections(self.bits[position])
+        union = self.counts + self.counts[position] - inter
+        return np.divide(inter, union, out=np.zeros(len(self), dtype=np.float32), where=union > 0)
+
+    def overlap(self, position):
+        """Coefficient de recouvrement |A ∩ B| / min(|A|, |B|) entre un film et tout le catalogue"""
+        inter = self.intersections(self.bits[position])
+        smallest = np.minimum(self.counts, self.counts[position])
+        return np.divide(inter, smallest, out=np.zeros(len(self), dtype=np.float32), where=smallest > 0)
+
+    def contains_any(self, labels):
+        """Masque booléen des films possédant au moins une des étiquettes"""
+        return (self.bits & self.encode(labels)).any(axis=1)
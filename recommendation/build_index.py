@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import argparse
+import time
+from recommendation.index import RecommenderIndex
+from recommendation.neighbors import NeighborTable, DEFAULT_NEIGHBORS
+from recommendation.embeddings import EmbeddingIndex, DEFAULT_COMPONENTS
+from recommendation.script import charger_donnees_films, INDEX_DIR
+
+CSV_URL = 'https://raw.githubusercontent.com/Lu6asM/film-recommender/refs/heads/main/data/processed/df_movie_cleaned.csv'
+
+
+def main():
+    """Construit hors ligne l'index de recommandation et la table des voisins"""
+    parser = argparse.ArgumentParser(description="Pré-calcul de l'index de recommandation")
+    parser.add_argument('--data', default=CSV_URL, help="Chemin ou URL du CSV nettoyé")
+    parser.add_argument('--output', default=INDEX_DIR, help="Dossier de l'index")
+    parser.add_argument('-k', '--neighbors', type=int, default=DEFAULT_NEIGHBORS, help="Nombre de voisins par film")
+    parser.add_argument('--chunk-size', type=int, default=None, help="Nombre de films par bloc de calcul")
+    parser.add_argument('--workers', type=int, default=1, help="Processus pour le calcul des voisins (0 pour un par cœur)")
+    parser.add_argument(
+        '--components', type=int, default=0,
+        help=f"Dimensions des embeddings denses, ex. {DEFAULT_COMPONENTS} (par défaut, aucun : ils remplacent "
+             "le score exact par un score approché)"
+    )
+    args = parser.parse_args()
+
+    movies_df = charger_donnees_films(args.data)
+    print(f"{len(movies_df)} films chargés")
+
+    start = time.perf_counter()
+    index = RecommenderIndex.load_or_build(movies_df, args.output)
+    print(f"Index prêt (version {index.version[:8]}) en {time.perf_counter() - start:.1f}s")
+
+    def progress(done, total, rate=None):
+        throughput = f" ({rate:.0f} films/s sur le dernier bloc)" if rate else ""
+        print(f"\rVoisins : {done}/{total} films{throughput}", end='', flush=True)
+
+    start = time.perf_counter()
+    table = NeighborTable.load(args.output)
+    if table is not None and table.version == index.version and table.k >= args.neighbors:
+        print("Table des voisins déjà à jour")
+    elif (
+        table is not None
+        and table.version == index.base_version
+        and len(table) == index.base_size
+        and table.k == args.neighbors
+    ):
+        # Ajout incrémental : seuls les nouveaux films sont comparés au catalogue
+        table = table.extend(index, chunk_size=args.chunk_size)
+        table.save(args.output)
+        print(f"Table des voisins mise à jour ({len(index) - index.base_size} nouveaux films) en {time.perf_counter() - start:.1f}s")
+    else:
+        if args.workers == 1:
+            table = NeighborTable.build(index, k=args.neighbors, chunk_size=args.chunk_size, progress=progress)
+        else:
+            table = NeighborTable.build_parallel(
+                index,
+                k=args.neighbors,
+                chunk_size=args.chunk_size,
+                workers=args.workers or None,
+                progress=progress
+            )
+        table.save(args.output)
+        print(f"\nTable des {table.k} voisins construite en {time.perf_counter() - start:.1f}s")
+
+    if args.components:
+        start = time.perf_counter()
+        embeddings = EmbeddingIndex.build(index, n_components=args.components)
+        embeddings.save(args.output)
+        print(f"Embeddings {embeddings.embeddings.shape[1]} dimensions construits en {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
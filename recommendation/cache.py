@@ -0,0 +1,92 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_CACHE_SIZE = 4096
+
+
+def value_nbytes(value):
+    """Mémoire occupée par un résultat : tableaux NumPy, seuls ou dans un tuple"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, tuple):
+        return sum(value_nbytes(item) for item in value)
+    return 0
+
+
+class RecommendationCache:
+    """
+    Cache LRU borné des résultats de recommandation.
+
+    Les clés sont de petits tuples (version du catalogue, tmdb_id, k, poids,
+    filtres) : un accès est en O(1), sans hacher le catalogue. Les valeurs sont
+    les positions et scores des films recommandés, pas des DataFrames.
+    Partagé entre les sessions Streamlit, il est protégé par un verrou.
+
+    Avec maxbytes, le cache est aussi borné en mémoire : les entrées les moins
+    récemment utilisées sont évincées tant que la taille totale des tableaux
+    dépasse le budget, et un résultat plus gros que le budget n'est pas conservé.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, maxbytes=None):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Renvoie le résultat associé à la clé (None si absent)"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Enregistre un résultat en évinçant le moins récemment utilisé si besoin"""
+        size = value_nbytes(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._sizes.pop(key)
+                del self._entries[key]
+            if self.maxbytes is not None and size > self.maxbytes:
+                return
+            self._entries[key] = value
+            self._sizes[key] = size
+            self.nbytes += size
+            while len(self._entries) > self.maxsize or (self.maxbytes is not None and self.nbytes > self.maxbytes):
+                evicted, _ = self._entries.popitem(last=False)
+                self.nbytes -= self._sizes.pop(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self.nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Compteurs du cache : succès, échecs, taux de succès, taille et mémoire occupée"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'nbytes': self.nbytes,
+                'maxbytes': self.maxbytes
+            }
@@ -0,0 +1,359 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+
+# Format de la colonne des acteurs : « Nom (Rôle), Nom (Rôle), ... »
+ACTOR_SEPARATOR = ', '
+ROLE_SEPARATOR = ' ('
+# Virgule à l'intérieur d'un rôle (un niveau de parenthèses imbriquées)
+COMMA_IN_ROLE = r'\((?:[^()]|\([^()]*\))*, '
+
+
+def read_only(df):
+    """
+    Catalogue partagé entre toutes les sessions, sans copie des colonnes.
+
+    Avec le copy-on-write de pandas, une affectation en place (loc, iloc) sur
+    un DataFrame issu du catalogue copie la colonne modifiée dans ce seul
+    DataFrame, sans lever d'erreur : les données des autres sessions ne
+    changent jamais. Les tableaux NumPy sous-jacents sont en plus marqués non
+    modifiables, pour le code qui écrirait directement dedans.
+
+    Args:
+        df (pd.DataFrame): Catalogue préparé
+
+    Returns:
+        pd.DataFrame: Catalogue aux mêmes colonnes, partageant leurs données
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype):
+            values = column.to_numpy()
+            values.flags.writeable = False
+            columns[name] = values
+        else:
+            # Tableaux d'extension (chaînes, catégories) : conservés tels quels
+            columns[name] = column.array
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _merge_split_roles(pieces, candidates):
+    """Recolle au précédent chaque morceau commençant dans une parenthèse ouverte"""
+    subset = pieces[candidates]
+    # Profondeur de parenthèses avant chaque morceau, remise à zéro à chaque film
+    depth = subset.str.count(r'\(') - subset.str.count(r'\)')
+    starts = np.ones(len(pieces), dtype=bool)
+    starts[candidates] = (depth.groupby(level=0).cumsum() - depth <= 0).to_numpy()
+
+    values = pieces.tolist()
+    for i in np.flatnonzero(~starts)[::-1]:
+        values[i - 1] = f"{values[i - 1]}{ACTOR_SEPARATOR}{values[i]}"
+    return pd.Series(values, index=pieces.index)[starts]
+
+
+def parse_actors(actors):
+    """
+    Découpe toute la colonne des acteurs en une table longue (film, acteur, rôle).
+
+    Chaque étape est une méthode vectorisée de pandas appliquée à tout le
+    catalogue en une passe. Un morceau dont les parenthèses ne sont pas
+    refermées (virgule dans un rôle : « Lui-même, présentateur ») est recollé
+    au suivant, et le rôle s'étend jusqu'à la dernière parenthèse, ce qui
+    conserve les parenthèses imbriquées (« Woody (voix) »).
+
+    Args:
+        actors (pd.Series): Colonne brute des acteurs, une chaîne par film
+
+    Returns:
+        tuple: Table (film, actor, role) ordonnée par film et offsets (n + 1) :
+        les acteurs du film i sont les lignes offsets[i]:offsets[i + 1]
+    """
+    actors = actors.reset_index(drop=True)
+    pieces = actors.str.split(ACTOR_SEPARATOR, regex=False).explode()
+    pieces = pieces[pieces.str.len() > 0]
+
+    # Seuls les films dont un rôle contient une virgule ont des morceaux à recoller
+    split_roles = actors.str.contains(COMMA_IN_ROLE, regex=True, na=False).to_numpy()[pieces.index]
+    if split_roles.any():
+        pieces = _merge_split_roles(pieces, split_roles)
+
+    names = pieces.str.replace(r' \(.*$', '', regex=True)
+    # Sans « ( », le morceau entier est remplacé : rôle vide
+    roles = pieces.str.replace(r'^[^(]*$|^[^(]* \(', '', regex=True).str.removesuffix(')')
+
+    films = pieces.index.to_numpy()
+    table = pd.DataFrame({'film': films, 'actor': names.array, 'role': roles.array})
+    offsets = np.zeros(len(actors) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(films, minlength=len(actors)), out=offsets[1:])
+    return table, offsets
+
+
+def actor_lists(table, offsets):
+    """Liste de paires (acteur, rôle) de chaque film, découpée dans la table longue"""
+    pairs = list(zip(table['actor'].tolist(), table['role'].tolist()))
+    bounds = offsets.tolist()
+    return [pairs[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def _plain_type(type_):
+    """Type Arrow équivalent, sans codage par dictionnaire"""
+    if pyarrow.types.is_list(type_):
+        return pyarrow.list_(_plain_type(type_.value_type))
+    if pyarrow.types.is_dictionary(type_):
+        return type_.value_type
+    return type_
+
+
+def encode_lists(array):
+    """
+    Colonne Arrow de listes au format compact : offsets int32 et chaînes codées en int32.
+
+    Les chaînes sont remplacées par leur code dans un vocabulaire partagé par
+    toute la colonne (type dictionary d'Arrow) ; dans une colonne de paires
+    (acteur, rôle), noms et rôles partagent le même vocabulaire.
+
+    Args:
+        array (pyarrow.Array | pyarrow.ChunkedArray): Colonne de listes de chaînes
+
+    Returns:
+        pyarrow.ListArray: Colonne de listes de type list<dictionary<int32, string>>
+    """
+    array = array.cast(_plain_type(array.type))
+    if isinstance(array, pyarrow.ChunkedArray):
+        array = array.combine_chunks()
+    offsets = array.offsets.to_numpy()
+    values = array.values.slice(offsets[0], offsets[-1] - offsets[0])
+    if pyarrow.types.is_list(values.type):
+        values = encode_lists(values)
+    else:
+        values = pc.dictionary_encode(values)
+    return pyarrow.ListArray.from_arrays(offsets - offsets[0], values, mask=array.is_null())
+
+
+class ListColumn:
+    """
+    Vue NumPy d'une colonne de listes (genres, mots-clés, acteurs...).
+
+    Les étiquettes du film i sont vocabulary[codes[offsets[i]:offsets[i + 1]]],
+    avec des offsets et des codes en int32. Sur une colonne au format compact
+    (encode_lists), la vue ne copie que le vocabulaire ; les requêtes sont des
+    opérations NumPy sur les codes, sans matérialiser de listes Python. Pour
+    une colonne de paires (acteur, rôle), les codes sont ceux des acteurs.
+    """
+
+    def __init__(self, offsets, codes, vocabulary):
+        self.offsets = offsets
+        self.codes = codes
+        self.vocabulary = vocabulary
+        self._lookup = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, position):
+        """Étiquettes d'un film"""
+        return self.vocabulary[self.codes[self.offsets[position]:self.offsets[position + 1]]].tolist()
+
+    @classmethod
+    def from_series(cls, values):
+        """Vue d'une colonne du catalogue, au format compact ou en listes Python"""
+        if pyarrow is not None and isinstance(values.dtype, pd.ArrowDtype):
+            return cls.from_arrow(pyarrow.array(values.array))
+        return cls.from_lists(values)
+
+    @classmethod
+    def from_arrow(cls, array):
+        """Vue d'une colonne Arrow de listes (codée au préalable si nécessaire)"""
+        if isinstance(array, pyarrow.ChunkedArray) or _plain_type(array.type) == array.type:
+            array = encode_lists(array)
+        offsets = array.offsets.to_numpy()
+        values = array.values.slice(offsets[0], offsets[-1] - offsets[0])
+        if pyarrow.types.is_list(values.type):
+            # Paires (acteur, rôle) : code du premier élément de chaque paire
+            strings = values.values
+            codes = strings.indices.to_numpy()[values.offsets.to_numpy()[:-1]]
+        else:
+            strings = values
+            codes = strings.indices.to_numpy()
+        vocabulary = strings.dictionary.to_numpy(zero_copy_only=False)
+        return cls(offsets - offsets[0], codes, vocabulary)
+
+    @classmethod
+    def from_lists(cls, values):
+        """Vue d'une série de listes Python (toute autre valeur compte comme une liste vide)"""
+        lists = values.apply(lambda x: x if isinstance(x, (list, tuple, np.ndarray)) else [])
+        lengths = lists.apply(len).to_numpy()
+        items = [item[0] if isinstance(item, (list, tuple, np.ndarray)) else item for item in lists.explode().dropna()]
+        codes, vocabulary = pd.factorize(pd.Series(items, dtype=object))
+        offsets = np.zeros(len(lists) + 1, dtype=np.int32)
+        np.cumsum(lengths, out=offsets[1:])
+        return cls(offsets, codes.astype(np.int32), np.asarray(vocabulary, dtype=object))
+
+    def lengths(self):
+        """Nombre d'étiquettes de chaque film"""
+        return np.diff(self.offsets)
+
+    def encode(self, labels):
+        """Codes des étiquettes (les étiquettes inconnues sont ignorées)"""
+        if self._lookup is None:
+            self._lookup = {label: code for code, label in enumerate(self.vocabulary.tolist())}
+        return np.array([self._lookup[label] for label in labels if label in self._lookup], dtype=np.int32)
+
+    def contains_any(self, labels):
+        """Masque booléen des films possédant au moins une des étiquettes"""
+        hits = np.concatenate(([0], np.cumsum(np.isin(self.codes, self.encode(labels)))))
+        return hits[self.offsets[1:]] > hits[self.offsets[:-1]]
+
+    def counts(self):
+        """Nombre d'occurrences de chaque étiquette du vocabulaire"""
+        return np.bincount(self.codes, minlength=len(self.vocabulary))
+
+    def labels(self):
+        """Étiquettes présentes dans la colonne, triées"""
+        return sorted(self.vocabulary[self.counts() > 0].tolist())
+
+
+def _to_lists(column):
+    """
+    Convertit une colonne Arrow de listes en listes Python.
+
+    Les valeurs sont extraites en un seul tableau puis découpées selon les
+    offsets de la colonne ; les listes de listes (paires acteur / rôle)
+    deviennent des listes de tuples.
+    """
+    array = column.combine_chunks()
+    offsets = array.offsets.to_numpy().tolist()
+    values = array.values
+    if pyarrow.types.is_list(values.type):
+        inner_offsets = values.offsets.to_numpy().tolist()
+        flat = values.values.to_numpy(zero_copy_only=False).tolist()
+        items = [tuple(flat[start:stop]) for start, stop in zip(inner_offsets[:-1], inner_offsets[1:])]
+    else:
+        items = values.to_numpy(zero_copy_only=False).tolist()
+    valid = array.is_valid().to_numpy(zero_copy_only=False).tolist()
+    return [items[start:stop] if ok else None for start, stop, ok in zip(offsets[:-1], offsets[1:], valid)]
+
+
+def arrow_to_frame(table, compact_lists=False):
+    """
+    Convertit une table Arrow (instantané Parquet) en DataFrame.
+
+    Les colonnes de listes redeviennent des listes Python ou, avec compact_lists,
+    restent au format Arrow compact (offsets et codes d'un vocabulaire, voir
+    encode_lists) derrière un pd.ArrowDtype.
+    """
+    list_columns = [field.name for field in table.schema if pyarrow.types.is_list(field.type)]
+    if compact_lists:
+        for name in list_columns:
+            table = table.set_column(table.schema.get_field_index(name), name, encode_lists(table.column(name)))
+        return table.to_pandas(types_mapper=lambda type_: pd.ArrowDtype(type_) if pyarrow.types.is_list(type_) else None)
+    df = table.drop_columns(list_columns).to_pandas()
+    for name in list_columns:
+        df[name] = pd.Series(_to_lists(table.column(name)), index=df.index, dtype=object)
+    return df[table.column_names]
+
+
+class LazyCatalog:
+    """
+    Catalogue adossé à un fichier Parquet, dont les colonnes sont lues à la demande.
+
+    frame(columns) lit une fois pour tout le catalogue chaque colonne demandée
+    puis la garde en mémoire, en lecture seule : une page qui ne trie que par
+    note ou par date ne charge ni les synopsis ni les acteurs. rows(positions)
+    lit les colonnes non chargées uniquement dans les groupes de lignes du
+    fichier qui contiennent ces films, si bien que les colonnes lourdes
+    (synopsis, mots-clés, acteurs) ne sont lues que pour les films affichés.
+    Les positions sont celles du catalogue, qui sert aussi d'index aux DataFrames.
+    Les DataFrames renvoyés portent la version du fichier lu dans
+    attrs['catalog_version'], qui change à chaque remplacement de l'instantané.
+    """
+
+    def __init__(self, path, compact_lists=True):
+        self.path = path
+        self.compact_lists = compact_lists
+        # Le fichier reste ouvert : un instantané remplacé entre-temps n'est pas relu
+        source = open(path, 'rb')
+        stat = os.fstat(source.fileno())
+        self.version = f"{stat.st_size}-{stat.st_mtime_ns}"
+        self._file = pq.ParquetFile(source)
+        self.columns = self._file.schema_arrow.names
+        metadata = self._file.metadata
+        self._group_sizes = np.array([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)], dtype=np.int64)
+        self._group_starts = np.concatenate(([0], np.cumsum(self._group_sizes)))
+        self._loaded = {}
+        # Le lecteur Parquet et le dictionnaire des colonnes sont partagés entre les sessions
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df):
+        """Catalogue entièrement en mémoire (sans pyarrow), avec la même interface"""
+        catalog = cls.__new__(cls)
+        catalog.path = None
+        catalog.version = None
+        catalog.compact_lists = False
+        catalog._file = None
+        catalog.columns = list(df.columns)
+        catalog._group_sizes = np.array([len(df)], dtype=np.int64)
+        catalog._group_starts = np.array([0, len(df)], dtype=np.int64)
+        catalog._loaded = {name: df[name].reset_index(drop=True) for name in df.columns}
+        catalog._lock = threading.Lock()
+        return catalog
+
+    def __len__(self):
+        return int(self._group_starts[-1])
+
+    def frame(self, columns=None):
+        """
+        Colonnes demandées (toutes par défaut) pour tout le catalogue.
+
+        Chaque colonne n'est lue qu'une fois ; le DataFrame renvoyé partage ses
+        données avec le catalogue, sans copie.
+        """
+        columns = list(self.columns if columns is None else columns)
+        with self._lock:
+            missing = [name for name in columns if name not in self._loaded]
+            if missing:
+                df = read_only(arrow_to_frame(self._file.read(columns=missing), self.compact_lists))
+                self._loaded.update({name: df[name] for name in missing})
+            df = pd.DataFrame({name: self._loaded[name] for name in columns}, copy=False)
+        df.attrs['catalog_version'] = self.version
+        return df
+
+    def rows(self, positions, columns=None):
+        """
+        Lignes des films demandés (toutes les colonnes par défaut), dans l'ordre donné.
+
+        Args:
+            positions (array-like): Positions des films dans le catalogue
+            columns (list, optional): Colonnes à renvoyer
+
+        Returns:
+            pd.DataFrame: Une ligne par film, indexée par sa position
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        columns = list(self.columns if columns is None else columns)
+        with self._lock:
+            loaded = {name: self._loaded[name] for name in columns if name in self._loaded}
+            missing = [name for name in columns if name not in loaded]
+            if missing:
+                # Seuls les groupes de lignes contenant les films demandés sont lus
+                groups = np.searchsorted(self._group_starts, positions, side='right') - 1
+                needed = np.unique(groups)
+                table = self._file.read_row_groups(needed.tolist(), columns=missing)
+        data = {name: column.array.take(positions) for name, column in loaded.items()}
+        if missing:
+            read_starts = np.concatenate(([0], np.cumsum(self._group_sizes[needed])))[np.searchsorted(needed, groups)]
+            part = arrow_to_frame(table.take(read_starts + positions - self._group_starts[groups]), self.compact_lists)
+            data.update({name: part[name].array for name in missing})
+        df = pd.DataFrame({name: data[name] for name in columns}, index=pd.Index(positions))
+        df.attrs['catalog_version'] = self.version
+        return df
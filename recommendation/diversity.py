@@ -0,0 +1,54 @@
+import numpy as np
+
+# Nombre de candidats re-classés par MMR
+DEFAULT_POOL_SIZE = 200
+# Poids de la pertinence face à la diversité (1 : pas de diversification)
+DEFAULT_LAMBDA = 0.7
+
+
+def mmr_rerank(relevance, similarity, k, lambda_=DEFAULT_LAMBDA):
+    """
+    Re-classement glouton par pertinence marginale maximale (MMR).
+
+    À chaque étape, le candidat retenu maximise
+    lambda_ * pertinence - (1 - lambda_) * similarité maximale aux films déjà retenus,
+    ce qui écarte les quasi-doublons (suites, même réalisateur) d'une liste.
+    La similarité maximale aux films retenus est mise à jour par un seul
+    np.maximum par étape.
+
+    Args:
+        relevance (np.ndarray): Score de chaque candidat vis-à-vis de la requête
+        similarity (np.ndarray): Matrice carrée des similarités entre candidats
+        k (int): Nombre de films à retenir
+        lambda_ (float): Compromis pertinence / diversité entre 0 et 1
+
+    Returns:
+        np.ndarray: Indices des candidats retenus, dans l'ordre de sélection
+    """
+    relevance = np.asarray(relevance, dtype=np.float32)
+    k = min(k, len(relevance))
+    selected = np.empty(k, dtype=np.int64)
+    max_similarity = np.zeros(len(relevance), dtype=np.float32)
+    available = np.ones(len(relevance), dtype=bool)
+
+    for step in range(k):
+        mmr_scores = lambda_ * relevance - (1 - lambda_) * max_similarity
+        mmr_scores[~available] = -np.inf
+        best = int(np.argmax(mmr_scores))
+        selected[step] = best
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
+
+
+def diversify(index, positions, scores, k, lambda_=DEFAULT_LAMBDA):
+    """
+    Re-classe par MMR un ensemble de films candidats d'un index.
+
+    Les similarités entre candidats sont calculées en un seul produit
+    (index.pairwise_similarities).
+
+    Returns:
+        np.ndarray: Indices des k candidats retenus, dans l'ordre de sélection
+    """
+    return mmr_rerank(scores, index.pairwise_similarities(positions), k, lambda_)
@@ -0,0 +1,124 @@
+import os
+import json
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+
+from recommendation.index import INDEX_FORMAT_VERSION, YEAR_WEIGHT, year_proximity, save_atomic
+
+DEFAULT_COMPONENTS = 256
+
+EMBEDDINGS_FILE = "embeddings.npy"
+# Années propres aux embeddings : years.npy de l'index TF-IDF est réécrit à chaque ajout incrémental
+EMBEDDINGS_YEARS_FILE = "embeddings_years.npy"
+EMBEDDINGS_META_FILE = "embeddings.json"
+
+
+def build_embeddings(index, n_components=DEFAULT_COMPONENTS, seed=0):
+    """
+    Réduit les critères pondérés de l'index à des vecteurs denses float32.
+
+    Les critères concaténés (chacun multiplié par la racine de son poids) sont
+    projetés par TruncatedSVD : le produit scalaire de deux vecteurs approche la
+    somme pondérée des similarités cosinus de l'index exact.
+    """
+    features = index.weighted_features()
+    n_components = min(n_components, min(features.shape) - 1)
+    svd = TruncatedSVD(n_components=n_components, random_state=seed)
+    return np.ascontiguousarray(svd.fit_transform(features), dtype=np.float32)
+
+
+class EmbeddingIndex:
+    """
+    Index de recommandation sur embeddings denses mappés en mémoire.
+
+    Les fichiers .npy sont ouverts avec mmap_mode='r' : tous les workers
+    Streamlit et toutes les exécutions en ligne de commande partagent les mêmes
+    pages du cache système, sans copie ni ré-apprentissage au démarrage. Une
+    requête est un produit matrice-vecteur (GEMV) sur N x n_components.
+    Les fichiers sont remplacés par renommage, jamais réécrits en place sous
+    un processus qui les mappe.
+    """
+
+    def __init__(self, version, embeddings, years):
+        self.version = version
+        self.embeddings = embeddings
+        self.years = years
+
+    def __len__(self):
+        return self.embeddings.shape[0]
+
+    @classmethod
+    def build(cls, index, n_components=DEFAULT_COMPONENTS, seed=0):
+        """Construit les embeddings à partir d'un RecommenderIndex"""
+        return cls(index.version, build_embeddings(index, n_components, seed), index.years)
+
+    def save(self, directory):
+        """Écrit les embeddings (.npy) et leurs métadonnées dans le dossier de l'index"""
+        os.makedirs(directory, exist_ok=True)
+        embeddings = np.asarray(self.embeddings, dtype=np.float32)
+        save_atomic(os.path.join(directory, EMBEDDINGS_FILE), lambda f: np.save(f, embeddings))
+        save_atomic(os.path.join(directory, EMBEDDINGS_YEARS_FILE), lambda f: np.save(f, np.asarray(self.years)))
+        meta = {'format': INDEX_FORMAT_VERSION, 'version': self.version, 'shape': list(self.embeddings.shape)}
+        save_atomic(os.path.join(directory, EMBEDDINGS_META_FILE), lambda f: f.write(json.dumps(meta).encode('utf-8')))
+
+    @classmethod
+    def load(cls, directory, version=None):
+        """Mappe les embeddings en mémoire (None si absents ou d'une autre version du catalogue)"""
+        try:
+            with open(os.path.join(directory, EMBEDDINGS_META_FILE), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('format') != INDEX_FORMAT_VERSION:
+            return None
+        if version is not None and meta.get('version') != version:
+            return None
+        years_path = os.path.join(directory, EMBEDDINGS_YEARS_FILE)
+        if not os.path.exists(years_path):
+            # Embeddings écrits avant EMBEDDINGS_YEARS_FILE : à reconstruire
+            return None
+
+        return cls(
+            meta['version'],
+            np.load(os.path.join(directory, EMBEDDINGS_FILE), mmap_mode='r'),
+            np.load(years_path, mmap_mode='r')
+        )
+
+    def similarities(self, position):
+        """Similarité approchée entre un film et tout le catalogue (un GEMV)"""
+        combined_similarity = self.embeddings @ self.embeddings[position]
+        return combined_similarity + year_proximity(self.years, self.years[position]) * YEAR_WEIGHT
+
+    def similarities_for(self, position, candidates):
+        """Similarité approchée entre un film et un sous-ensemble de candidats"""
+        candidates = np.asarray(candidates)
+        combined_similarity = self.embeddings[candidates] @ self.embeddings[position]
+        return combined_similarity + year_proximity(self.years[candidates], self.years[position]) * YEAR_WEIGHT
+
+    def similarities_batch(self, positions):
+        """Similarités approchées entre plusieurs films et tout le catalogue (un GEMM)"""
+        positions = np.asarray(positions)
+        scores = self.embeddings[positions] @ self.embeddings.T
+        scores += year_proximity(self.years[None, :], self.years[positions, None]) * np.float32(YEAR_WEIGHT)
+        return scores
+
+    def pairwise_similarities(self, positions):
+        """Matrice len(positions) x len(positions) des similarités approchées entre quelques films"""
+        positions = np.asarray(positions)
+        rows = self.embeddings[positions]
+        scores = rows @ rows.T
+        scores += year_proximity(self.years[positions, None], self.years[None, positions]) * np.float32(YEAR_WEIGHT)
+        return scores
+
+    @property
+    def profile_dim(self):
+        """Dimension d'un vecteur de profil utilisateur"""
+        return self.embeddings.shape[1]
+
+    def add_to_profile(self, vector, position, sign=1):
+        """Ajoute (ou retire si sign=-1) l'embedding d'un film à un vecteur de profil"""
+        vector += sign * self.embeddings[position]
+
+    def score_profile(self, vector):
+        """Produit scalaire entre un vecteur de profil et tout le catalogue (un GEMV)"""
+        return self.embeddings @ vector
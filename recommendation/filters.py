@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from recommendation.bitsets import MultiHotBitset
+
+
+class CatalogFilters:
+    """
+    Colonnes de filtrage pré-calculées pour construire des masques de candidats.
+
+    Les critères de la page Découvrir (genres, note minimale, décennie, durée
+    maximale) deviennent des opérations NumPy vectorisées sur tout le catalogue,
+    appliquées avant la sélection top-k : une recommandation filtrée renvoie
+    exactement k films dès que le catalogue filtré en contient assez.
+    """
+
+    def __init__(self, movies_df):
+        # Genres multi-hot compressés en bits (un mot uint64 par film)
+        self.genres = MultiHotBitset.from_lists(movies_df['genres'])
+
+        self.ratings = pd.to_numeric(movies_df['imdb_rating'], errors='coerce').to_numpy(dtype=float)
+        self.runtimes = pd.to_numeric(movies_df['runtime'], errors='coerce').to_numpy(dtype=float)
+        self.decades = movies_df['decade'].astype(str).to_numpy()
+
+    def __len__(self):
+        return len(self.ratings)
+
+    def mask(self, genres=None, note_min=0, decennie=None, duree_max=None):
+        """
+        Masque booléen des films respectant les critères (None si aucun critère).
+
+        Args:
+            genres (list, optional): Au moins un de ces genres
+            note_min (float): Note IMDb minimale
+            decennie (str, optional): Décennie exacte
+            duree_max (int, optional): Durée maximale en minutes
+        """
+        if not genres and not note_min and not decennie and not duree_max:
+            return None
+
+        mask = np.ones(len(self), dtype=bool)
+        if genres:
+            mask &= self.genres.contains_any(genres)
+        if note_min:
+            mask &= self.ratings >= note_min
+        if decennie:
+            mask &= self.decades == str(decennie)
+        if duree_max:
+            mask &= self.runtimes <= duree_max
+        return mask
@@ -0,0 +1,603 @@
+import os
+import re
+import json
+import hashlib
+import joblib
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from recommendation.selection import top_k_rows, select_top_k
+
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+except ImportError:
+    pyarrow = None
+
+# Poids des critères dans la similarité combinée
+FEATURE_WEIGHTS = {
+    'genres': 0.4,
+    'keywords': 0.2,
+    'director': 0.15,
+    'actors': 0.15,
+    'overview': 0.1
+}
+YEAR_WEIGHT = 0.1
+
+# Composantes de la similarité : un critère TF-IDF par ligne, puis l'année
+COMPONENTS = list(FEATURE_WEIGHTS) + ['year']
+
+INDEX_FORMAT_VERSION = 3
+TOKEN_PATTERN = r'\b\w+\b'
+HASH_MULTIPLIER = 1099511628211
+
+# Part maximale de films ajoutés depuis le dernier apprentissage complet avant reconstruction
+MAX_INCREMENTAL_RATIO = 0.2
+
+# Année inconnue dans la colonne compacte (int16) des années de sortie
+MISSING_YEAR = -1
+# Table de proximité temporelle 1 / (1 + |Δannée|) indexée par l'écart d'années.
+# La dernière case vaut 0 et sert aux films dont l'année est inconnue.
+MAX_YEAR_DIFF = 2048
+YEAR_PROXIMITY_TABLE = np.append(1 / (1 + np.arange(MAX_YEAR_DIFF, dtype=np.float32)), np.float32(0))
+
+
+def save_atomic(path, save):
+    """
+    Écrit un fichier sous un nom temporaire puis le renomme à sa place.
+
+    Un processus qui lit (ou mappe en mémoire) l'ancien fichier le conserve
+    intact : il ne voit jamais un fichier tronqué en cours d'écriture.
+
+    Args:
+        save (callable): Écrit le contenu dans le fichier binaire ouvert reçu
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        save(f)
+    os.replace(tmp_path, path)
+
+
+def process_feature(data):
+    """Transforme une valeur de critère (liste, éventuellement de paires, ou texte) en document texte"""
+    if isinstance(data, (list, tuple, np.ndarray)):
+        return ' '.join(map(process_feature, data))
+    if data is None or data is pd.NA:
+        return ''
+    return str(data)
+
+
+def is_list_column(values):
+    """Indique si une colonne contient des listes (format Arrow compact ou listes Python)"""
+    if isinstance(values.dtype, pd.ArrowDtype):
+        return pyarrow.types.is_list(values.dtype.pyarrow_dtype)
+    if values.dtype != object:
+        return False
+    valid = values.dropna()
+    return len(valid) > 0 and isinstance(valid.iloc[0], (list, tuple, np.ndarray))
+
+
+def _token_strings(array):
+    """
+    Tokens (minuscules, séparés par une espace) de chaque valeur d'un tableau Arrow.
+
+    Seuls les libellés distincts sont découpés, une fois chacun ; les listes,
+    éventuellement imbriquées (paires acteur / rôle), sont jointes sans leurs
+    éléments vides.
+    """
+    if pyarrow.types.is_list(array.type):
+        offsets = array.offsets.to_numpy()
+        values = _token_strings(array.values.slice(offsets[0], offsets[-1] - offsets[0]))
+        kept = pc.not_equal(values, '').to_numpy(zero_copy_only=False)
+        kept_offsets = np.concatenate(([0], np.cumsum(kept)))[offsets - offsets[0]].astype(np.int32)
+        lists = pyarrow.ListArray.from_arrays(kept_offsets, values.filter(kept), mask=array.is_null())
+        return pc.fill_null(pc.binary_join(lists, ' '), '')
+
+    if not pyarrow.types.is_dictionary(array.type):
+        array = pc.dictionary_encode(array.cast(pyarrow.string()))
+    tokens = pyarrow.array(
+        [' '.join(re.findall(TOKEN_PATTERN, str(label).lower())) for label in array.dictionary.to_pylist()],
+        pyarrow.string()
+    )
+    return pc.fill_null(tokens.take(array.indices), '')
+
+
+def token_documents(values):
+    """
+    Documents de tokens d'une colonne de listes, sans parcours Python des films.
+
+    Le résultat ne dépend pas de la mise en forme des listes (paires acteur /
+    rôle ou textes « Acteur (Rôle) », Arrow compact ou listes Python) et donne
+    la même matrice TF-IDF que process_feature.
+    """
+    array = pyarrow.array(values.array if isinstance(values.dtype, pd.ArrowDtype) else values, from_pandas=True)
+    if isinstance(array, pyarrow.ChunkedArray):
+        array = array.combine_chunks()
+    return pd.Series(_token_strings(array).to_numpy(zero_copy_only=False), index=values.index, dtype=object)
+
+
+def feature_documents(movies_df, feature):
+    """Construit la série de documents texte d'un critère pour tout le catalogue"""
+    values = movies_df[feature]
+    if pyarrow is not None and is_list_column(values):
+        return token_documents(values)
+    return values.apply(process_feature).fillna('')
+
+
+def release_years(movies_df):
+    """Extrait l'année de sortie de chaque film en int16 (MISSING_YEAR si la date est inconnue)"""
+    if 'release_year' in movies_df.columns:
+        years = pd.to_numeric(movies_df['release_year'], errors='coerce')
+    else:
+        years = pd.to_datetime(movies_df['release_date'], errors='coerce').dt.year
+    return years.fillna(MISSING_YEAR).to_numpy(dtype=np.int16)
+
+
+def weight_vector(weights=None):
+    """
+    Vecteur des poids dans l'ordre de COMPONENTS.
+
+    Args:
+        weights (dict, optional): {critère ou 'year': poids}, les poids absents
+            reprennent leur valeur par défaut
+    """
+    defaults = {**FEATURE_WEIGHTS, 'year': YEAR_WEIGHT}
+    weights = {**defaults, **(weights or {})}
+    return np.array([weights[component] for component in COMPONENTS], dtype=np.float32)
+
+
+def is_default_weights(weights):
+    """Indique si un jeu de poids correspond aux poids par défaut"""
+    return weights is None or np.allclose(weight_vector(weights), weight_vector())
+
+
+def year_proximity(years, reference_years):
+    """
+    Score de proximité temporelle 1 / (1 + |Δannée|), nul si une année est inconnue.
+
+    Le score est lu dans YEAR_PROXIMITY_TABLE à partir de l'écart entier des
+    années : ni conversion de dates ni division à chaque requête.
+
+    Args:
+        years (np.ndarray): Années int16 des films comparés
+        reference_years (int | np.ndarray): Année(s) de référence, diffusées sur years
+
+    Returns:
+        np.ndarray: Scores en float32
+    """
+    years = np.asarray(years, dtype=np.int32)
+    reference_years = np.asarray(reference_years, dtype=np.int32)
+    year_diff = np.minimum(np.abs(years - reference_years), MAX_YEAR_DIFF - 1)
+    missing = (years == MISSING_YEAR) | (reference_years == MISSING_YEAR)
+    return YEAR_PROXIMITY_TABLE[np.where(missing, MAX_YEAR_DIFF, year_diff)]
+
+
+def row_hashes(movies_df):
+    """
+    Calcule une empreinte (uint64) par film à partir des colonnes utilisées par l'index.
+
+    Les colonnes de listes sont réduites à leurs tokens (voir token_documents) :
+    deux chargements qui ne diffèrent que par leur mise en forme (ex. acteurs en
+    paires ou en texte) partagent l'index. Les colonnes de texte (synopsis,
+    réalisateur) et les identifiants sont hachés tels quels, sans découpage :
+    le calcul reste bien plus court qu'une reconstruction de l'index.
+    """
+    hashes = np.full(len(movies_df), INDEX_FORMAT_VERSION, dtype=np.uint64)
+    columns = ['tmdb_id', 'release_date'] + [f for f in FEATURE_WEIGHTS if f in movies_df.columns]
+    for col in columns:
+        values = movies_df[col]
+        if is_list_column(values):
+            if pyarrow is not None:
+                values = token_documents(values)
+            else:
+                values = values.apply(process_feature).str.lower().str.findall(TOKEN_PATTERN).str.join(' ')
+        else:
+            values = values.astype(str)
+        column_hashes = pd.util.hash_pandas_object(values, index=False).to_numpy()
+        hashes = (hashes * np.uint64(HASH_MULTIPLIER)) ^ column_hashes
+    return hashes
+
+
+def catalog_version(movies_df=None, hashes=None):
+    """Calcule la version du catalogue à partir des empreintes de ses films"""
+    hashes = row_hashes(movies_df) if hashes is None else hashes
+    return hashlib.sha1(np.ascontiguousarray(hashes).tobytes()).hexdigest()
+
+
+class RecommenderIndex:
+    """
+    Index de recommandation pré-calculé.
+
+    Les matrices TF-IDF de chaque critère sont apprises une seule fois sur le
+    catalogue puis sauvegardées sur disque avec la version du catalogue. Elles
+    sont ensuite concaténées en une seule matrice CSR pondérée (weighted_features) :
+    une requête avec les poids par défaut se résume à un produit matrice creuse /
+    vecteur.
+
+    Les films ajoutés en fin de catalogue sont vectorisés avec le vocabulaire et
+    les poids IDF déjà appris (append), sans ré-apprentissage. fitted_size garde
+    la taille du catalogue lors du dernier apprentissage complet (build).
+    """
+
+    def __init__(self, version, feature_matrices, vectorizers, years, tmdb_ids, hashes=None):
+        self.version = version
+        self.feature_matrices = feature_matrices
+        self.vectorizers = vectorizers
+        self.years = years
+        self.tmdb_ids = tmdb_ids
+        self.hashes = hashes
+        self.fitted_size = len(tmdb_ids)
+        # Version et taille de l'index avant le dernier ajout incrémental
+        self.base_version = None
+        self.base_size = None
+        self._weighted = None
+        self._weighted_transposed = None
+
+    def __len__(self):
+        return len(self.tmdb_ids)
+
+    @classmethod
+    def build(cls, movies_df, hashes=None):
+        """Apprend les matrices TF-IDF de chaque critère sur le catalogue"""
+        hashes = row_hashes(movies_df) if hashes is None else hashes
+        feature_matrices = {}
+        vectorizers = {}
+        for feature in FEATURE_WEIGHTS:
+            if feature not in movies_df.columns:
+                continue
+            vectorizer = TfidfVectorizer(token_pattern=TOKEN_PATTERN, dtype=np.float32)
+            feature_matrices[feature] = vectorizer.fit_transform(feature_documents(movies_df, feature)).tocsr()
+            vectorizers[feature] = vectorizer
+
+        return cls(
+            version=catalog_version(hashes=hashes),
+            feature_matrices=feature_matrices,
+            vectorizers=vectorizers,
+            years=release_years(movies_df),
+            tmdb_ids=movies_df['tmdb_id'].to_numpy(),
+            hashes=hashes
+        )
+
+    def append(self, new_movies_df, hashes):
+        """
+        Ajoute des films en fin d'index avec le vocabulaire déjà appris.
+
+        Les termes absents du vocabulaire sont ignorés et les poids IDF ne sont
+        pas recalculés : le coût est proportionnel au nombre de films ajoutés.
+
+        Args:
+            new_movies_df (pd.DataFrame): Films ajoutés, dans l'ordre du catalogue
+            hashes (np.ndarray): Empreintes du catalogue complet après ajout
+        """
+        self.base_version = self.version
+        self.base_size = len(self)
+        for feature, vectorizer in self.vectorizers.items():
+            new_rows = vectorizer.transform(feature_documents(new_movies_df, feature))
+            self.feature_matrices[feature] = sparse.vstack([self.feature_matrices[feature], new_rows], format='csr')
+
+        self.years = np.concatenate([self.years, release_years(new_movies_df)])
+        self.tmdb_ids = np.concatenate([self.tmdb_ids, new_movies_df['tmdb_id'].to_numpy()])
+        self.hashes = hashes
+        self.version = catalog_version(hashes=hashes)
+        self._weighted = None
+        self._weighted_transposed = None
+
+    def save(self, directory):
+        """Sauvegarde l'index dans un dossier"""
+        os.makedirs(directory, exist_ok=True)
+        for feature, matrix in self.feature_matrices.items():
+            save_atomic(os.path.join(directory, f"{feature}.npz"), lambda f: sparse.save_npz(f, matrix))
+        save_atomic(os.path.join(directory, "vectorizers.joblib"), lambda f: joblib.dump(self.vectorizers, f))
+        save_atomic(os.path.join(directory, "years.npy"), lambda f: np.save(f, self.years))
+        save_atomic(os.path.join(directory, "tmdb_ids.npy"), lambda f: np.save(f, self.tmdb_ids, allow_pickle=True))
+        if self.hashes is not None:
+            save_atomic(os.path.join(directory, "hashes.npy"), lambda f: np.save(f, self.hashes))
+
+        # Les métadonnées sont écrites en dernier : elles valident l'index complet
+        meta = {
+            'format': INDEX_FORMAT_VERSION,
+            'version': self.version,
+            'features': list(self.feature_matrices),
+            'n_movies': len(self),
+            'fitted_size': self.fitted_size,
+            'base_version': self.base_version,
+            'base_size': self.base_size
+        }
+        save_atomic(os.path.join(directory, "meta.json"), lambda f: f.write(json.dumps(meta).encode('utf-8')))
+
+    @staticmethod
+    def read_version(directory):
+        """Lit la version de catalogue d'un index sauvegardé (None si absent)"""
+        try:
+            with open(os.path.join(directory, "meta.json"), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get('format') != INDEX_FORMAT_VERSION:
+            return None
+        return meta.get('version')
+
+    @classmethod
+    def load(cls, directory):
+        """Charge un index sauvegardé"""
+        with open(os.path.join(directory, "meta.json"), encoding='utf-8') as f:
+            meta = json.load(f)
+
+        feature_matrices = {
+            feature: sparse.load_npz(os.path.join(directory, f"{feature}.npz")).tocsr()
+            for feature in meta['features']
+        }
+        hashes_path = os.path.join(directory, "hashes.npy")
+        index = cls(
+            version=meta['version'],
+            feature_matrices=feature_matrices,
+            vectorizers=joblib.load(os.path.join(directory, "vectorizers.joblib")),
+            years=np.load(os.path.join(directory, "years.npy")),
+            tmdb_ids=np.load(os.path.join(directory, "tmdb_ids.npy"), allow_pickle=True),
+            hashes=np.load(hashes_path) if os.path.exists(hashes_path) else None
+        )
+        # Index sauvegardé avant fitted_size : au plus tard, appris avant le dernier ajout
+        index.fitted_size = meta.get('fitted_size', meta.get('base_size') or meta['n_movies'])
+        index.base_version = meta.get('base_version')
+        index.base_size = meta.get('base_size')
+        return index
+
+    @classmethod
+    def from_weighted(cls, version, weighted, weighted_transposed, years):
+        """Index réduit à la matrice pondérée et à sa transposée (calculs par lots dans un processus de travail)"""
+        index = cls(version, {}, {}, years, tmdb_ids=np.arange(weighted.shape[0]))
+        index._weighted = weighted
+        index._weighted_transposed = weighted_transposed
+        return index
+
+    @classmethod
+    def load_or_build(cls, movies_df, directory, hashes=None):
+        """
+        Charge l'index sauvegardé s'il correspond au catalogue, sinon le met à jour.
+
+        Si le catalogue ne fait qu'ajouter des films à la fin de celui de l'index
+        sauvegardé, seuls les nouveaux films sont vectorisés. Sinon (films modifiés
+        ou supprimés, ou ajouts cumulés depuis le dernier apprentissage complet
+        dépassant MAX_INCREMENTAL_RATIO de sa taille), l'index est reconstruit :
+        le vocabulaire et les poids IDF intègrent alors les nouveaux termes.
+        """
+        hashes = row_hashes(movies_df) if hashes is None else hashes
+        version = catalog_version(hashes=hashes)
+        saved_version = cls.read_version(directory)
+        if saved_version == version:
+            return cls.load(directory)
+
+        if saved_version is not None:
+            index = cls.load(directory)
+            n_saved = len(index)
+            if (
+                index.hashes is not None
+                and n_saved < len(hashes) <= index.fitted_size * (1 + MAX_INCREMENTAL_RATIO)
+                and np.array_equal(index.hashes, hashes[:n_saved])
+            ):
+                index.append(movies_df.iloc[n_saved:], hashes)
+                index.save(directory)
+                return index
+
+        index = cls.build(movies_df, hashes=hashes)
+        index.save(directory)
+        return index
+
+    def year_scores(self, position):
+        """Score de proximité temporelle 1 / (1 + |Δannée|) avec le film de référence"""
+        return year_proximity(self.years, self.years[position])
+
+    def feature_similarities(self, position):
+        """
+        Composantes de la similarité entre un film et tout le catalogue.
+
+        Returns:
+            np.ndarray: Matrice len(COMPONENTS) x N (une ligne par critère, puis l'année).
+            Tout jeu de poids se combine ensuite en un seul produit matrice-vecteur.
+        """
+        components = np.zeros((len(COMPONENTS), len(self)), dtype=np.float32)
+        for row, feature in enumerate(COMPONENTS[:-1]):
+            matrix = self.feature_matrices.get(feature)
+            if matrix is not None:
+                components[row] = matrix.dot(matrix[position].toarray().ravel())
+        components[-1] = self.year_scores(position)
+        return components
+
+    def similarities(self, position, weights=None):
+        """
+        Similarité combinée entre le film à la position donnée et tout le catalogue.
+
+        Avec les poids par défaut, un seul produit de la matrice pondérée par la
+        ligne du film ; sinon les composantes par critère sont recombinées.
+        """
+        if not is_default_weights(weights):
+            return weight_vector(weights) @ self.feature_similarities(position)
+
+        features = self.weighted_features()
+        combined_similarity = features.dot(features[position].toarray().ravel())
+        return combined_similarity + self.year_scores(position) * np.float32(YEAR_WEIGHT)
+
+    def similarities_for(self, position, candidates):
+        """Similarité combinée exacte entre un film et un sous-ensemble de candidats"""
+        candidates = np.asarray(candidates)
+        features = self.weighted_features()
+        combined_similarity = features[candidates].dot(features[position].toarray().ravel())
+        return combined_similarity + year_proximity(self.years[candidates], self.years[position]) * np.float32(YEAR_WEIGHT)
+
+    def weighted_features(self):
+        """
+        Concatène les critères normalisés, chacun multiplié par la racine de son poids.
+
+        Le produit scalaire de deux lignes vaut la somme pondérée des similarités
+        cosinus par critère (hors proximité temporelle).
+        """
+        if self._weighted is None:
+            self._weighted = sparse.hstack([
+                matrix * np.float32(np.sqrt(FEATURE_WEIGHTS[feature]))
+                for feature, matrix in self.feature_matrices.items()
+            ], format='csr')
+        return self._weighted
+
+    @property
+    def profile_dim(self):
+        """Dimension d'un vecteur de profil utilisateur"""
+        return self.weighted_features().shape[1]
+
+    def add_to_profile(self, vector, position, sign=1):
+        """Ajoute (ou retire si sign=-1) le vecteur d'un film à un vecteur de profil dense"""
+        row = self.weighted_features()[position]
+        vector[row.indices] += sign * row.data
+
+    def score_profile(self, vector):
+        """Produit scalaire entre un vecteur de profil et tout le catalogue"""
+        return self.weighted_features() @ vector
+
+    def weighted_transposed(self):
+        """Transposée (CSC) de la matrice pondérée, calculée une fois pour les produits par lots"""
+        if self._weighted_transposed is None:
+            self._weighted_transposed = self.weighted_features().T.tocsc()
+        return self._weighted_transposed
+
+    def similarities_batch(self, positions):
+        """
+        Similarité combinée entre plusieurs films et tout le catalogue.
+
+        Un seul produit matrice creuse x matrice (sur la matrice pondérée) est
+        effectué pour l'ensemble des films demandés.
+
+        Args:
+            positions (np.ndarray): Positions des films de référence
+
+        Returns:
+            np.ndarray: Matrice len(positions) x N de similarités en float32
+        """
+        positions = np.asarray(positions)
+        scores = (self.weighted_features()[positions] @ self.weighted_transposed()).toarray()
+
+        scores += year_proximity(self.years[None, :], self.years[positions, None]) * np.float32(YEAR_WEIGHT)
+        return scores
+
+    def pairwise_similarities(self, positions):
+        """Matrice len(positions) x len(positions) des similarités combinées entre quelques films"""
+        positions = np.asarray(positions)
+        rows = self.weighted_features()[positions]
+        scores = (rows @ rows.T).toarray()
+        scores += year_proximity(self.years[positions, None], self.years[None, positions]) * np.float32(YEAR_WEIGHT)
+        return scores
+
+
+def find_position(movies_df, movie_title, lookup=None):
+    """
+    Position du premier film portant ce titre original.
+
+    Args:
+        lookup (CatalogLookup, optional): Index de recherche du catalogue, qui
+            remplace le parcours de la colonne des titres par une table de hachage
+    """
+    if lookup is not None:
+        position = lookup.by_title(movie_title)
+    else:
+        positions = np.flatnonzero(movies_df['title'].to_numpy() == movie_title)
+        position = int(positions[0]) if len(positions) else None
+    if position is None:
+        raise ValueError(f"Le film '{movie_title}' n'est pas dans la base de données.")
+    return position
+
+
+def recommend_positions(index, position, k=5, neighbors=None, ann=None, mask=None):
+    """
+    Positions et scores des k films les plus similaires au film à la position donnée.
+
+    Si une table de voisins pré-calculée couvre k, la recommandation est une
+    simple lecture de ligne. Sinon, un index approché (LSHIndex) limite le
+    calcul exact aux candidats qu'il propose. Un masque booléen de candidats
+    (voir CatalogFilters) est appliqué avant la sélection des k films.
+    """
+    if neighbors is not None and k <= neighbors.k:
+        movie_indices, scores = neighbors.lookup(position)
+        if mask is not None:
+            kept = mask[movie_indices]
+            movie_indices, scores = movie_indices[kept], scores[kept]
+        # Avec un masque sélectif, la table peut ne pas contenir k voisins retenus
+        if len(movie_indices) >= k:
+            return movie_indices[:k], scores[:k]
+
+    if ann is not None:
+        movie_indices, scores = ann.query(position, k, mask=mask)
+        if len(movie_indices) >= k:
+            return movie_indices, scores
+
+    combined_similarity = index.similarities(position)
+    # Le film de référence est exclu par sa position, pas par son rang
+    return select_top_k(combined_similarity, k, exclude=position, mask=mask)
+
+
+def recommend_from_index(index, movies_df, movie_title, k=5, neighbors=None, ann=None, mask=None):
+    """Renvoie les k films les plus similaires à un titre à partir de l'index"""
+    position = find_position(movies_df, movie_title)
+    movie_indices, scores = recommend_positions(index, position, k, neighbors=neighbors, ann=ann, mask=mask)
+
+    recommended_films = movies_df.iloc[movie_indices].copy()
+    recommended_films['similarity_score'] = scores
+    return recommended_films
+
+
+def resolve_positions(movies_df, titles=None, tmdb_ids=None, lookup=None):
+    """
+    Associe des titres ou des identifiants TMDb à leur position dans le catalogue.
+
+    Args:
+        lookup (CatalogLookup, optional): Index de recherche du catalogue déjà construit
+
+    Returns:
+        dict: {titre ou tmdb_id: position} pour les films trouvés, dans l'ordre demandé
+    """
+    if lookup is not None:
+        find = lookup.by_title if titles is not None else lookup.by_tmdb_id
+        found = {key: find(key) for key in (titles if titles is not None else tmdb_ids)}
+        return {key: position for key, position in found.items() if position is not None}
+
+    if titles is not None:
+        keys = list(titles)
+        lookup_keys = keys
+        column = movies_df['title']
+    else:
+        keys = list(tmdb_ids)
+        lookup_keys = [str(tmdb_id) for tmdb_id in keys]
+        column = movies_df['tmdb_id'].astype(str)
+
+    # Première occurrence de chaque valeur, comme iloc[0] sur un filtre
+    first = ~column.duplicated().to_numpy()
+    lookup = dict(zip(column.to_numpy()[first], np.flatnonzero(first)))
+    return {key: int(lookup[lookup_key]) for key, lookup_key in zip(keys, lookup_keys) if lookup_key in lookup}
+
+
+def recommend_batch(index, movies_df, titles=None, tmdb_ids=None, k=5, neighbors=None, batch_size=256, lookup=None):
+    """
+    Recommandations pour plusieurs films en une seule passe.
+
+    Les similarités de tous les films demandés sont calculées par produits
+    matrice creuse x matrice, par lots de batch_size films, puis les k meilleurs
+    films de chaque ligne sont sélectionnés. Les films introuvables sont ignorés.
+
+    Returns:
+        dict: {titre ou tmdb_id: (positions, scores) des k films recommandés},
+        comme recommend_positions ; les DataFrames sont construits par l'appelant
+    """
+    positions = resolve_positions(movies_df, titles=titles, tmdb_ids=tmdb_ids, lookup=lookup)
+    keys = list(positions)
+    all_positions = np.array([positions[key] for key in keys], dtype=np.int64)
+
+    if neighbors is not None and k <= neighbors.k:
+        top_positions = neighbors.neighbors[all_positions, :k]
+        top_scores = neighbors.scores[all_positions, :k].astype(np.float64)
+    else:
+        top_positions = np.empty((len(keys), min(k, len(index) - 1)), dtype=np.int32)
+        top_scores = np.empty(top_positions.shape, dtype=np.float64)
+        for start in range(0, len(keys), batch_size):
+            batch = all_positions[start:start + batch_size]
+            scores = index.similarities_batch(batch)
+            top_positions[start:start + len(batch)], top_scores[start:start + len(batch)] = top_k_rows(scores, k, exclude=batch)
+
+    return {key: (movie_indices, scores) for key, movie_indices, scores in zip(keys, top_positions, top_scores)}
@@ -0,0 +1,47 @@
+import numpy as np
+
+# Colonnes indexées ; les identifiants sont comparés sous forme de texte
+LOOKUP_COLUMNS = ('tmdb_id', 'imdb_id', 'title', 'title_fr')
+ID_COLUMNS = ('tmdb_id', 'imdb_id')
+
+
+class CatalogLookup:
+    """
+    Index de recherche des films du catalogue par identifiant ou par titre.
+
+    Chaque colonne de LOOKUP_COLUMNS devient une table de hachage valeur ->
+    position, construite une fois par version du catalogue : une recherche ne
+    parcourt plus le DataFrame. Si plusieurs films partagent une valeur (titres
+    homonymes), la première occurrence du catalogue l'emporte, comme iloc[0]
+    sur un filtre booléen.
+    """
+
+    def __init__(self, movies_df):
+        self.tables = {}
+        for column in LOOKUP_COLUMNS:
+            if column not in movies_df.columns:
+                continue
+            values = movies_df[column]
+            valid = values.notna().to_numpy()
+            if column in ID_COLUMNS:
+                values = values.astype(str)
+            first = valid & ~values.duplicated().to_numpy()
+            self.tables[column] = dict(zip(values.to_numpy()[first].tolist(), np.flatnonzero(first).tolist()))
+
+    def position(self, column, value):
+        """Position du film ayant cette valeur dans la colonne (None si absent)"""
+        if column in ID_COLUMNS:
+            value = str(value)
+        return self.tables.get(column, {}).get(value)
+
+    def by_tmdb_id(self, tmdb_id):
+        """Position du film ayant cet identifiant TMDb"""
+        return self.position('tmdb_id', tmdb_id)
+
+    def by_imdb_id(self, imdb_id):
+        """Position du film ayant cet identifiant IMDb"""
+        return self.position('imdb_id', imdb_id)
+
+    def by_title(self, title, column='title'):
+        """Position du premier film portant ce titre ('title' ou 'title_fr')"""
+        return self.position(column, title)
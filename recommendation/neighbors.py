@@ -0,0 +1,255 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from scipy import sparse
+
+from recommendation.selection import top_k_rows
+from recommendation.index import save_atomic
+
+DEFAULT_NEIGHBORS = 100
+
+# Nombre maximal de scores denses (float32) calculés à la fois par bloc de lignes
+MAX_BLOCK_ELEMENTS = 2 ** 24
+
+
+# Nombre minimal de blocs par processus, pour équilibrer la charge entre eux
+CHUNKS_PER_WORKER = 4
+
+
+def default_chunk_size(n_movies):
+    """Taille de bloc telle qu'un bloc de scores denses reste sous MAX_BLOCK_ELEMENTS"""
+    return max(1, min(n_movies, MAX_BLOCK_ELEMENTS // max(n_movies, 1)))
+
+
+def _share(array, segments):
+    """Copie un tableau dans un segment de mémoire partagée et renvoie de quoi le rattacher"""
+    array = np.ascontiguousarray(array)
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return segment.name, array.shape, array.dtype.str
+
+
+def _attach(spec, segments):
+    """Vue NumPy sur un segment de mémoire partagée créé par _share"""
+    name, shape, dtype = spec
+    segment = shared_memory.SharedMemory(name=name)
+    segments.append(segment)
+    return np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+# État d'un processus de travail : index et tableaux de sortie rattachés à la mémoire partagée
+_worker = {}
+
+
+def _init_worker(version, shapes, specs, k):
+    """Rattache un processus de travail aux entrées et sorties partagées"""
+    from recommendation.index import RecommenderIndex
+
+    segments = []
+    arrays = {name: _attach(spec, segments) for name, spec in specs.items()}
+    weighted = sparse.csr_matrix(
+        (arrays['data'], arrays['indices'], arrays['indptr']), shape=shapes['weighted'], copy=False
+    )
+    weighted_transposed = sparse.csc_matrix(
+        (arrays['t_data'], arrays['t_indices'], arrays['t_indptr']), shape=shapes['transposed'], copy=False
+    )
+    _worker.update(
+        index=RecommenderIndex.from_weighted(version, weighted, weighted_transposed, arrays['years']),
+        neighbors=arrays['neighbors'],
+        scores=arrays['scores'],
+        k=k,
+        segments=segments
+    )
+
+
+def _chunk_neighbors(start, stop):
+    """Calcule les voisins d'un bloc de films et les écrit dans les sorties partagées"""
+    begin = time.perf_counter()
+    positions = np.arange(start, stop)
+    block = _worker['index'].similarities_batch(positions)
+    _worker['neighbors'][start:stop], _worker['scores'][start:stop] = top_k_rows(block, _worker['k'], exclude=positions)
+    return start, stop, time.perf_counter() - begin
+
+
+class NeighborTable:
+    """
+    Table pré-calculée des K films les plus similaires à chaque film.
+
+    Les voisins sont stockés en positions int32 et les scores en float16 ;
+    une recommandation se résume à la lecture d'une ligne.
+    """
+
+    FILENAME = "neighbors.npz"
+
+    def __init__(self, version, neighbors, scores):
+        self.version = version
+        self.neighbors = neighbors
+        self.scores = scores
+
+    @property
+    def k(self):
+        return self.neighbors.shape[1]
+
+    def __len__(self):
+        return self.neighbors.shape[0]
+
+    @classmethod
+    def build(cls, index, k=DEFAULT_NEIGHBORS, chunk_size=None, progress=None):
+        """
+        Calcule la table des voisins par blocs de lignes.
+
+        La matrice N x N complète n'est jamais construite : seul un bloc
+        chunk_size x N de scores est présent en mémoire à la fois.
+        """
+        n_movies = len(index)
+        chunk_size = chunk_size or default_chunk_size(n_movies)
+        k = min(k, n_movies - 1)
+
+        neighbors = np.empty((n_movies, k), dtype=np.int32)
+        scores = np.empty((n_movies, k), dtype=np.float16)
+        for start in range(0, n_movies, chunk_size):
+            stop = min(start + chunk_size, n_movies)
+            positions = np.arange(start, stop)
+            block = index.similarities_batch(positions)
+            neighbors[start:stop], block_scores = top_k_rows(block, k, exclude=positions)
+            scores[start:stop] = block_scores
+            if progress:
+                progress(stop, n_movies)
+
+        return cls(index.version, neighbors, scores)
+
+    @classmethod
+    def build_parallel(cls, index, k=DEFAULT_NEIGHBORS, chunk_size=None, workers=None, progress=None):
+        """
+        Calcule la table des voisins par blocs de lignes répartis sur un pool de processus.
+
+        La matrice pondérée de l'index, sa transposée, les années et les tableaux
+        de sortie sont placés une seule fois en mémoire partagée : chaque processus
+        s'y rattache sans copie, calcule les scores de ses blocs contre tout le
+        catalogue et écrit directement leurs K meilleurs voisins.
+
+        Args:
+            workers (int, optional): Nombre de processus (par défaut, un par cœur)
+            progress (callable, optional): Appelé après chaque bloc avec le nombre
+                de films traités, le total et le débit du bloc en films par seconde
+        """
+        n_movies = len(index)
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or min(
+            default_chunk_size(n_movies),
+            max(1, -(-n_movies // (workers * CHUNKS_PER_WORKER)))
+        )
+        k = min(k, n_movies - 1)
+
+        weighted = index.weighted_features()
+        transposed = index.weighted_transposed()
+        segments = []
+        try:
+            specs = {
+                'data': _share(weighted.data, segments),
+                'indices': _share(weighted.indices, segments),
+                'indptr': _share(weighted.indptr, segments),
+                't_data': _share(transposed.data, segments),
+                't_indices': _share(transposed.indices, segments),
+                't_indptr': _share(transposed.indptr, segments),
+                'years': _share(index.years, segments),
+                'neighbors': _share(np.empty((n_movies, k), dtype=np.int32), segments),
+                'scores': _share(np.empty((n_movies, k), dtype=np.float16), segments),
+            }
+            shapes = {'weighted': weighted.shape, 'transposed': transposed.shape}
+
+            done = 0
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(index.version, shapes, specs, k)
+            ) as pool:
+                futures = [
+                    pool.submit(_chunk_neighbors, start, min(start + chunk_size, n_movies))
+                    for start in range(0, n_movies, chunk_size)
+                ]
+                for future in as_completed(futures):
+                    start, stop, seconds = future.result()
+                    done += stop - start
+                    if progress:
+                        progress(done, n_movies, (stop - start) / max(seconds, 1e-9))
+
+            buffers = {segment.name: segment.buf for segment in segments}
+            neighbors, scores = (
+                np.ndarray(shape, dtype=dtype, buffer=buffers[name]).copy()
+                for name, shape, dtype in (specs['neighbors'], specs['scores'])
+            )
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
+        return cls(index.version, neighbors, scores)
+
+    def extend(self, index, chunk_size=None):
+        """
+        Met à jour la table après un ajout incrémental de films à l'index.
+
+        Seuls les nouveaux films sont comparés au catalogue : ils reçoivent leur
+        propre liste de voisins, et la liste d'un film existant n'est modifiée que
+        si un nouveau film dépasse son K-ième voisin actuel. Le coût est
+        proportionnel au nombre de films ajoutés.
+        """
+        n_old, n_movies = len(self), len(index)
+        chunk_size = chunk_size or default_chunk_size(n_movies)
+
+        neighbors = np.empty((n_movies, self.k), dtype=np.int32)
+        scores = np.empty((n_movies, self.k), dtype=np.float16)
+        neighbors[:n_old], scores[:n_old] = self.neighbors, self.scores
+
+        for start in range(n_old, n_movies, chunk_size):
+            stop = min(start + chunk_size, n_movies)
+            positions = np.arange(start, stop)
+            block = index.similarities_batch(positions)
+
+            # Films existants dont le K-ième voisin est battu par un nouveau film
+            new_scores = block[:, :n_old].T
+            kth_scores = scores[:n_old, -1].astype(np.float32)
+            affected = np.flatnonzero((new_scores > kth_scores[:, None]).any(axis=1))
+            if len(affected):
+                merged_positions = np.hstack([neighbors[affected], np.broadcast_to(positions, (len(affected), len(positions)))])
+                merged_scores = np.hstack([scores[affected].astype(np.float32), new_scores[affected]])
+                top, top_scores = top_k_rows(merged_scores, self.k)
+                neighbors[affected] = np.take_along_axis(merged_positions, top, axis=1)
+                scores[affected] = top_scores
+
+            # Voisins des nouveaux films sur tout le catalogue
+            neighbors[start:stop], block_scores = top_k_rows(block, self.k, exclude=positions)
+            scores[start:stop] = block_scores
+
+        return NeighborTable(index.version, neighbors, scores)
+
+    def lookup(self, position, k=None):
+        """Renvoie les positions et scores des k plus proches voisins d'un film"""
+        k = self.k if k is None else k
+        return self.neighbors[position, :k], self.scores[position, :k].astype(np.float64)
+
+    def save(self, directory):
+        """Sauvegarde la table dans le dossier de l'index"""
+        os.makedirs(directory, exist_ok=True)
+        save_atomic(os.path.join(directory, self.FILENAME), lambda f: np.savez(
+            f,
+            neighbors=self.neighbors,
+            scores=self.scores,
+            version=np.array(self.version)
+        ))
+
+    @classmethod
+    def load(cls, directory, version=None):
+        """Charge la table sauvegardée (None si absente ou d'une autre version du catalogue)"""
+        path = os.path.join(directory, cls.FILENAME)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            table_version = str(data['version'])
+            if version is not None and table_version != version:
+                return None
+            return cls(table_version, data['neighbors'], data['scores'])
@@ -0,0 +1,74 @@
+import numpy as np
+
+from recommendation.index import MISSING_YEAR, YEAR_WEIGHT, year_proximity
+from recommendation.selection import select_top_k
+
+
+class UserProfile:
+    """
+    Profil d'un utilisateur : somme des vecteurs de ses films favoris.
+
+    Le profil est mis à jour en O(taille d'un film) à chaque ajout ou retrait de
+    favori, et le catalogue est noté en une seule passe : la latence ne dépend
+    pas du nombre de favoris.
+    """
+
+    def __init__(self, engine, id_positions, user_id=None):
+        """
+        Args:
+            engine: Index de recommandation (RecommenderIndex ou EmbeddingIndex)
+            id_positions (dict): {str(tmdb_id): position dans le catalogue}
+            user_id (int, optional): Utilisateur propriétaire du profil
+        """
+        self.engine = engine
+        self.version = engine.version
+        self.id_positions = id_positions
+        self.user_id = user_id
+        self.vector = np.zeros(engine.profile_dim, dtype=np.float32)
+        self.favorites = {}
+        self.year_sum = 0.0
+        self.year_count = 0
+
+    def __len__(self):
+        return len(self.favorites)
+
+    def add(self, tmdb_id):
+        """Ajoute un film favori au profil (sans effet s'il y est déjà ou est inconnu)"""
+        key = str(tmdb_id)
+        position = self.id_positions.get(key)
+        if position is None or key in self.favorites:
+            return False
+        self._update(position, 1)
+        self.favorites[key] = position
+        return True
+
+    def remove(self, tmdb_id):
+        """Retire un film favori du profil"""
+        position = self.favorites.pop(str(tmdb_id), None)
+        if position is None:
+            return False
+        self._update(position, -1)
+        return True
+
+    def _update(self, position, sign):
+        self.engine.add_to_profile(self.vector, position, sign)
+        year = self.engine.years[position]
+        if year != MISSING_YEAR:
+            self.year_sum += sign * year
+            self.year_count += sign
+
+    def scores(self):
+        """Score de chaque film du catalogue : similarité moyenne aux favoris + proximité temporelle"""
+        if not self.favorites:
+            return np.zeros(len(self.engine))
+
+        combined_similarity = self.engine.score_profile(self.vector) / len(self.favorites)
+        if self.year_count:
+            mean_year = round(self.year_sum / self.year_count)
+            combined_similarity = combined_similarity + year_proximity(self.engine.years, mean_year) * YEAR_WEIGHT
+        return combined_similarity
+
+    def recommend(self, k=10, mask=None):
+        """Positions et scores des k films les mieux notés, favoris exclus"""
+        exclude = np.fromiter(self.favorites.values(), dtype=np.int64, count=len(self.favorites))
+        return select_top_k(self.scores(), k, exclude=exclude, mask=mask)
@@ -1,7 +1,13 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import pandas as pd
-import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
+from recommendation.index import RecommenderIndex, row_hashes, catalog_version, recommend_from_index, recommend_positions
+from recommendation.neighbors import NeighborTable
+from recommendation.embeddings import EmbeddingIndex
+from recommendation.search import TitleSearch
+from recommendation.snapshot import load_snapshot
 import colorama
 from colorama import Fore, Style
 import time
@@ -10,6 +16,8 @@ import random
 # Initialisation de colorama pour les couleurs dans le terminal
 colorama.init()
 
+INDEX_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'recommender_index')
+
 def print_header(text):
     """Affiche un header formaté"""
     print(f"\n{Fore.CYAN}{'='*80}")
@@ -29,10 +37,8 @@ def print_movie(title, year, genres, overview, similarity=None):
     print(f"{Fore.WHITE}{overview}{Style.RESET_ALL}\n")
     print("-" * 80)
 
-def charger_donnees_films(chemin_fichier):
-    """Charge et prépare les données des films"""
-    df = pd.read_csv(chemin_fichier)
-    
+def preparer_donnees_films(df):
+    """Prépare le CSV brut des films (listes découpées, colonnes renommées)"""
     # Traitement des colonnes
     colonnes_list = ['Genres', 'Mots-Clés', 'Acteurs']
     for col in colonnes_list:
@@ -42,55 +48,35 @@ def charger_donnees_films(chemin_fichier):
     df['genres'] = df['Genres']
     df['keywords'] = df['Mots-Clés']
     df['title'] = df['Titre Original']
+    df['title_fr'] = df['Titre Français']
     df['overview'] = df['Synopsis']
     df['release_date'] = df['Date de Sortie']
     df['director'] = df['Réalisateur(s)']
     df['cast'] = df['Acteurs']
+    df['actors'] = df['Acteurs']
+    df['tmdb_id'] = df['ID tmdb']
     
     return df
 
-def recommander_films(movie_title, movies_df, k=5):
-    """Système de recommandation de films"""
-    feature_mapping = {
-        'genres': 0.4,
-        'keywords': 0.2,
-        'director': 0.15,
-        'cast': 0.15,
-        'overview': 0.1
-    }
-
-    if movie_title not in movies_df['title'].values:
-        raise ValueError(f"Le film '{movie_title}' n'a pas été trouvé dans la base de données.")
-
-    ref_movie = movies_df[movies_df['title'] == movie_title].iloc[0]
-    combined_similarity = np.zeros(len(movies_df))
-    
-    for feature, weight in feature_mapping.items():
-        vectorizer = TfidfVectorizer(token_pattern=r'\b\w+\b')
-        
-        def process_feature(data):
-            if isinstance(data, list):
-                return ' '.join(map(str, data))
-            return str(data)
-
-        feature_data = movies_df[feature].apply(process_feature).fillna('')
-        feature_matrix = vectorizer.fit_transform(feature_data)
-        ref_vector = vectorizer.transform([process_feature(ref_movie[feature])])
-        similarity = cosine_similarity(ref_vector, feature_matrix)[0]
-        
-        combined_similarity += similarity * weight
-
-    # Score basé sur l'année
-    year_diff = abs(pd.to_datetime(movies_df['release_date']).dt.year - 
-                   pd.to_datetime(ref_movie['release_date']).year)
-    year_score = 1 / (1 + year_diff)
-    combined_similarity += year_score * 0.1
-
-    movie_indices = combined_similarity.argsort()[::-1][1:k+1]
+def charger_donnees_films(chemin_fichier):
+    """Charge les données des films depuis l'instantané local (voir recommendation/snapshot.py)"""
+    return load_snapshot(chemin_fichier, preparer_donnees_films, name='movies_cli')
+
+def recommander_films(movie_title, movies_df, k=5, index=None, neighbors=None, position=None):
+    """
+    Système de recommandation de films.
+
+    Avec position, le film de référence est celui-ci, même si d'autres films
+    portent le même titre (remakes).
+    """
+    if index is None:
+        index = RecommenderIndex.load_or_build(movies_df, INDEX_DIR)
+    if position is None:
+        return recommend_from_index(index, movies_df, movie_title, k, neighbors=neighbors)
+    movie_indices, scores = recommend_positions(index, position, k, neighbors=neighbors)
     recommended_films = movies_df.iloc[movie_indices].copy()
-    recommended_films['similarity_score'] = combined_similarity[movie_indices]
-    
-    return recommended_films.sort_values('similarity_score', ascending=False)
+    recommended_films['similarity_score'] = scores
+    return recommended_films
 
 def demonstration():
     """Fonction principale de démonstration"""
@@ -101,6 +87,16 @@ def demonstration():
     try:
         movies_df = charger_donnees_films('https://raw.githubusercontent.com/Lu6asM/film-recommender/refs/heads/main/data/processed/df_movie_cleaned.csv')
         print(f"{Fore.GREEN}✓ Base de données chargée avec succès : {len(movies_df)} films{Style.RESET_ALL}")
+        # Empreintes calculées une fois, pour les embeddings comme pour l'index TF-IDF
+        hashes = row_hashes(movies_df)
+        index = EmbeddingIndex.load(INDEX_DIR, version=catalog_version(hashes=hashes))
+        if index is None:
+            index = RecommenderIndex.load_or_build(movies_df, INDEX_DIR, hashes=hashes)
+        print(f"{Fore.GREEN}✓ Index de recommandation prêt (version {index.version[:8]}){Style.RESET_ALL}")
+        search = TitleSearch(movies_df)
+        neighbors = NeighborTable.load(INDEX_DIR, version=index.version)
+        if neighbors is not None:
+            print(f"{Fore.GREEN}✓ Table des {neighbors.k} voisins chargée{Style.RESET_ALL}")
     except Exception as e:
         print(f"{Fore.RED}Erreur lors du chargement des données : {str(e)}{Style.RESET_ALL}")
         return
@@ -127,7 +123,15 @@ def demonstration():
                 choice = random.choice(films_demo)
                 print(f"{Fore.GREEN}Film choisi aléatoirement : {choice}{Style.RESET_ALL}")
 
-            film = movies_df[movies_df['title'] == choice].iloc[0]
+            # Recherche tolérante : accents, casse, début de titre ou fautes de frappe
+            matches = search.search(choice, k=1)
+            if not matches:
+                print(f"{Fore.RED}Aucun film ne correspond à '{choice}'{Style.RESET_ALL}")
+                continue
+            film = movies_df.iloc[matches[0]]
+            if film['title'] != choice:
+                print(f"{Fore.GREEN}Film trouvé : {film['title']}{Style.RESET_ALL}")
+            choice = film['title']
             print_movie(
                 film['title'],
                 pd.to_datetime(film['release_date']).year,
@@ -138,7 +142,8 @@ def demonstration():
             print(f"{Fore.CYAN}Recherche des recommandations...{Style.RESET_ALL}")
             time.sleep(1)  # Effet de "calcul"
 
-            recommendations = recommander_films(choice, movies_df, k=5)
+            # Recommandations du film trouvé, pas d'un homonyme résolu à nouveau par son titre
+            recommendations = recommander_films(choice, movies_df, k=5, index=index, neighbors=neighbors, position=matches[0])
             print_section(f"Top 5 des films recommandés basés sur '{choice}'")
             
             for _, rec in recommendations.iterrows():
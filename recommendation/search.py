@@ -0,0 +1,125 @@
+import re
+import unicodedata
+from bisect import bisect_left
+import numpy as np
+
+# Colonnes de titres indexées
+SEARCH_COLUMNS = ('title', 'title_fr')
+DEFAULT_RESULTS = 10
+# Similarité minimale (Jaccard sur les trigrammes) d'une correspondance approchée
+MIN_TRIGRAM_SCORE = 0.2
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_title(title):
+    """Titre sans accents, en minuscules, ponctuation remplacée par des espaces"""
+    decomposed = unicodedata.normalize('NFKD', str(title))
+    folded = ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+    return _NON_ALNUM.sub(' ', folded).strip()
+
+
+def trigrams(text):
+    """Trigrammes de caractères d'un texte normalisé, bordé d'espaces"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleSearch:
+    """
+    Moteur de recherche en mémoire sur les titres originaux et français.
+
+    Les titres sont normalisés (accents retirés, casse ignorée), si bien que
+    « amelie » trouve « Le Fabuleux Destin d'Amélie Poulain ». Une requête
+    cherche d'abord les titres dont un mot commence par le texte saisi (recherche
+    dichotomique dans une liste triée de suffixes de mots), puis complète par
+    des correspondances approchées sur les trigrammes de caractères, qui
+    tolèrent les fautes de frappe.
+    """
+
+    def __init__(self, movies_df, columns=SEARCH_COLUMNS):
+        titles = []
+        positions = []
+        for column in columns:
+            if column not in movies_df.columns:
+                continue
+            for position, title in enumerate(movies_df[column].to_numpy()):
+                if isinstance(title, str) and title:
+                    titles.append(normalize_title(title))
+                    positions.append(position)
+
+        # Un titre identique en VO et en VF n'est indexé qu'une fois par film
+        entries = dict.fromkeys(zip(titles, positions))
+        self.titles = [title for title, _ in entries]
+        self.positions = np.fromiter((position for _, position in entries), dtype=np.int64, count=len(entries))
+        self.lengths = np.array([len(title) for title in self.titles], dtype=np.int32)
+
+        # Suffixes commençant à chaque début de mot, triés pour la recherche par préfixe
+        suffixes = []
+        for entry, title in enumerate(self.titles):
+            for match in re.finditer(r'\S+', title):
+                suffixes.append((title[match.start():], entry))
+        suffixes.sort()
+        self.suffixes = [suffix for suffix, _ in suffixes]
+        self.suffix_entries = np.array([entry for _, entry in suffixes], dtype=np.int64)
+
+        # Listes inversées trigramme -> entrées
+        postings = {}
+        self.trigram_counts = np.empty(len(self.titles), dtype=np.int32)
+        for entry, title in enumerate(self.titles):
+            grams = trigrams(title)
+            self.trigram_counts[entry] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(entry)
+        self.postings = {gram: np.array(entries, dtype=np.int64) for gram, entries in postings.items()}
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _prefix_entries(self, query):
+        """Entrées dont un mot du titre commence par la requête"""
+        start = bisect_left(self.suffixes, query)
+        stop = bisect_left(self.suffixes, query + '\uffff', lo=start)
+        return self.suffix_entries[start:stop]
+
+    def _trigram_scores(self, query):
+        """Entrées partageant des trigrammes avec la requête et leur similarité de Jaccard"""
+        grams = [self.postings[gram] for gram in trigrams(query) if gram in self.postings]
+        if not grams:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        shared = np.bincount(np.concatenate(grams), minlength=len(self))
+        entries = np.flatnonzero(shared)
+        shared = shared[entries]
+        scores = shared / (len(trigrams(query)) + self.trigram_counts[entries] - shared)
+        return entries, scores
+
+    def search(self, query, k=DEFAULT_RESULTS):
+        """
+        Positions des k films dont le titre correspond le mieux à la requête.
+
+        Les correspondances par préfixe passent en premier (titres les plus
+        courts d'abord), suivies des correspondances approchées par similarité
+        décroissante. Un film n'apparaît qu'une fois.
+        """
+        query = normalize_title(query)
+        if not query or not len(self):
+            return []
+
+        prefix = self._prefix_entries(query)
+        if len(prefix) > 2 * k:
+            # Un film a au plus deux titres : ses 2k titres les plus courts contiennent k films
+            prefix = prefix[np.argpartition(self.lengths[prefix], 2 * k)[:2 * k]]
+        prefix = prefix[np.argsort(self.lengths[prefix], kind='stable')]
+        results = list(dict.fromkeys(self.positions[prefix].tolist()))[:k]
+
+        if len(results) < k:
+            entries, scores = self._trigram_scores(query)
+            kept = scores >= MIN_TRIGRAM_SCORE
+            entries, scores = entries[kept], scores[kept]
+            order = np.argsort(-scores, kind='stable')
+            for position in self.positions[entries[order]].tolist():
+                if len(results) >= k:
+                    break
+                if position not in results:
+                    results.append(position)
+        return results
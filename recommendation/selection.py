@@ -0,0 +1,75 @@
+import numpy as np
+
+
+def top_k_rows(scores, k, exclude=None):
+    """
+    Sélectionne les k meilleurs films de chaque ligne d'une matrice de scores.
+
+    Args:
+        scores (np.ndarray): Matrice n x N de scores (modifiée en place si exclude est fourni)
+        k (int): Nombre de films à conserver par ligne
+        exclude (np.ndarray, optional): Position du film de référence à exclure pour chaque ligne
+
+    Returns:
+        tuple: Positions (int32) et scores des k meilleurs films, triés par score décroissant
+    """
+    n_rows, n_movies = scores.shape
+    if exclude is not None:
+        scores[np.arange(n_rows), exclude] = -np.inf
+        n_movies -= 1
+
+    k = min(k, n_movies)
+    if k <= 0:
+        return np.empty((n_rows, 0), dtype=np.int32), np.empty((n_rows, 0), dtype=scores.dtype)
+
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+
+    positions = np.take_along_axis(candidates, order, axis=1).astype(np.int32)
+    return positions, np.take_along_axis(candidate_scores, order, axis=1)
+
+
+def select_top_k(scores, k, exclude=None, mask=None):
+    """
+    Sélectionne les k meilleurs films d'un vecteur de scores en O(N).
+
+    Args:
+        scores (np.ndarray): Scores de tout le catalogue
+        k (int): Nombre de films à renvoyer
+        exclude (int ou array, optional): Position(s) à exclure (ex. le film de référence)
+        mask (np.ndarray, optional): Masque booléen des films candidats
+
+    Returns:
+        tuple: Positions et scores des k meilleurs films, triés par score décroissant
+    """
+    excluded = np.atleast_1d(exclude) if exclude is not None else np.empty(0, dtype=np.int64)
+
+    if mask is not None:
+        keep = np.array(mask, dtype=bool)
+        keep[excluded] = False
+        candidates = np.flatnonzero(keep)
+        candidate_scores = scores[candidates]
+        n_extra = 0
+    else:
+        # Sans masque, on sélectionne quelques films de plus puis on retire les exclus
+        candidates = None
+        candidate_scores = scores
+        n_extra = len(excluded)
+
+    n_select = min(k + n_extra, len(candidate_scores))
+    if n_select <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+
+    n_candidates = len(candidate_scores)
+    if n_select < n_candidates:
+        top = np.argpartition(candidate_scores, n_candidates - n_select)[n_candidates - n_select:]
+    else:
+        top = np.arange(n_candidates)
+    top = top[np.argsort(-candidate_scores[top], kind='stable')]
+
+    positions = top if candidates is None else candidates[top]
+    if n_extra:
+        positions = positions[~np.isin(positions, excluded)]
+    positions = positions[:k]
+    return positions, scores[positions]
@@ -0,0 +1,221 @@
+import os
+import json
+import time
+import threading
+import pandas as pd
+import requests
+from recommendation.catalog import arrow_to_frame
+
+try:
+    import pyarrow
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'snapshot')
+SNAPSHOT_FORMAT_VERSION = 2
+# Lignes par groupe du fichier Parquet : granularité de la lecture des seuls films affichés
+SNAPSHOT_ROW_GROUP_SIZE = 1024
+
+# Délai minimal entre deux vérifications de la source distante (secondes)
+REFRESH_INTERVAL = 15 * 60
+REQUEST_TIMEOUT = 30
+
+_refreshing = set()
+_refresh_lock = threading.Lock()
+
+
+def _paths(name, directory):
+    return os.path.join(directory, f"{name}.parquet"), os.path.join(directory, f"{name}.json")
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(meta_path, meta):
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+def _is_url(source):
+    return source.startswith(('http://', 'https://'))
+
+
+def _local_validators(source):
+    """Validateurs d'un fichier local : taille et date de modification"""
+    stat = os.stat(source)
+    return {'etag': str(stat.st_size), 'last_modified': str(stat.st_mtime_ns)}
+
+
+def _read(data_path, compact_lists=False):
+    """Lit un instantané Parquet (voir arrow_to_frame pour les colonnes de listes)"""
+    return arrow_to_frame(pq.read_table(data_path), compact_lists)
+
+
+def _build(csv_path, source, prepare, name, directory, prepare_version, validators):
+    """Lit un CSV, le prépare et écrit l'instantané Parquet (écriture atomique)"""
+    df = prepare(pd.read_csv(csv_path))
+    os.makedirs(directory, exist_ok=True)
+    data_path, meta_path = _paths(name, directory)
+    tmp_path = f"{data_path}.tmp"
+    df.to_parquet(tmp_path, index=False, row_group_size=SNAPSHOT_ROW_GROUP_SIZE)
+    os.replace(tmp_path, data_path)
+    # Les métadonnées sont écrites en dernier : elles valident l'instantané
+    _write_meta(meta_path, {
+        'format': SNAPSHOT_FORMAT_VERSION,
+        'prepare_version': prepare_version,
+        'source': source,
+        'etag': validators.get('etag'),
+        'last_modified': validators.get('last_modified'),
+        'checked_at': time.time()
+    })
+
+
+def _download(source, name, directory, meta=None):
+    """
+    Télécharge le CSV distant, par une requête conditionnelle si meta est fourni.
+
+    Returns:
+        tuple: Chemin du CSV téléchargé et validateurs (ETag, Last-Modified),
+        ou None si la source n'a pas changé depuis l'instantané
+    """
+    headers = {}
+    if meta and meta.get('etag'):
+        headers['If-None-Match'] = meta['etag']
+    if meta and meta.get('last_modified'):
+        headers['If-Modified-Since'] = meta['last_modified']
+    response = requests.get(source, headers=headers, timeout=REQUEST_TIMEOUT)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+
+    validators = {'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+    if meta and validators['etag'] and validators['etag'] == meta.get('etag'):
+        return None
+
+    os.makedirs(directory, exist_ok=True)
+    csv_path = os.path.join(directory, f"{name}.csv.tmp")
+    with open(csv_path, 'wb') as f:
+        f.write(response.content)
+    return csv_path, validators
+
+
+def _build_from_url(source, prepare, name, directory, prepare_version, meta=None):
+    """Télécharge la source puis reconstruit l'instantané (False si la source n'a pas changé)"""
+    downloaded = _download(source, name, directory, meta)
+    if downloaded is None:
+        return False
+    csv_path, validators = downloaded
+    try:
+        _build(csv_path, source, prepare, name, directory, prepare_version, validators)
+    finally:
+        os.remove(csv_path)
+    return True
+
+
+def _refresh(source, prepare, name, directory, prepare_version, meta, on_refresh):
+    """
+    Vérifie la source distante en arrière-plan et remplace l'instantané si elle a changé.
+
+    Sans modification, seule la date de vérification est mise à jour ; après un
+    remplacement, on_refresh est appelé (ex. pour vider un cache Streamlit).
+    """
+    try:
+        if not _build_from_url(source, prepare, name, directory, prepare_version, meta):
+            _write_meta(_paths(name, directory)[1], {**meta, 'checked_at': time.time()})
+        elif on_refresh:
+            on_refresh()
+    except (requests.RequestException, OSError, ValueError):
+        # Hors ligne ou source indisponible : l'instantané local reste utilisé
+        pass
+    finally:
+        with _refresh_lock:
+            _refreshing.discard((name, directory))
+
+
+def ensure_snapshot(source, prepare, name, directory=SNAPSHOT_DIR, prepare_version=1, on_refresh=None):
+    """
+    Chemin de l'instantané Parquet local d'un catalogue préparé, construit si besoin.
+
+    Au premier appel, le CSV source est lu et préparé une fois, puis
+    l'instantané versionné est écrit (colonnes déjà découpées et converties).
+    Pour une source distante, un fil d'exécution en arrière-plan vérifie au plus
+    toutes les REFRESH_INTERVAL secondes si le fichier a changé (ETag /
+    Last-Modified) et remplace l'instantané le cas échéant ; un fichier local
+    modifié est reconstruit immédiatement. Peu coûteux (un stat et la lecture
+    des métadonnées), il doit être appelé à chaque chargement et non depuis une
+    fonction mise en cache, sans quoi la vérification n'a lieu qu'une fois.
+
+    Args:
+        source (str): URL ou chemin du CSV
+        prepare (callable): Transforme le DataFrame brut en DataFrame prêt à l'emploi
+        name (str): Nom de l'instantané (un par préparation différente)
+        prepare_version (int): À incrémenter quand prepare change, pour invalider l'instantané
+        on_refresh (callable, optional): Appelé après le remplacement de l'instantané
+
+    Returns:
+        str: Chemin du fichier Parquet, ou None sans pyarrow
+    """
+    if pyarrow is None:
+        return None
+
+    data_path, meta_path = _paths(name, directory)
+    meta = _read_meta(meta_path)
+    valid = (
+        meta is not None
+        and meta.get('format') == SNAPSHOT_FORMAT_VERSION
+        and meta.get('prepare_version') == prepare_version
+        and meta.get('source') == source
+        and os.path.exists(data_path)
+    )
+
+    if not _is_url(source):
+        validators = _local_validators(source)
+        if not (valid and meta.get('etag') == validators['etag'] and meta.get('last_modified') == validators['last_modified']):
+            _build(source, source, prepare, name, directory, prepare_version, validators)
+            if valid and on_refresh:
+                on_refresh()
+        return data_path
+
+    if not valid:
+        _build_from_url(source, prepare, name, directory, prepare_version)
+        return data_path
+
+    if time.time() - meta.get('checked_at', 0) >= REFRESH_INTERVAL:
+        with _refresh_lock:
+            start = (name, directory) not in _refreshing
+            _refreshing.add((name, directory))
+        if start:
+            threading.Thread(
+                target=_refresh,
+                args=(source, prepare, name, directory, prepare_version, meta, on_refresh),
+                daemon=True
+            ).start()
+    return data_path
+
+
+def load_snapshot(source, prepare, name, directory=SNAPSHOT_DIR, prepare_version=1, on_refresh=None, compact_lists=False):
+    """
+    Charge un catalogue préparé depuis son instantané Parquet local (voir ensure_snapshot).
+
+    Les appels suivant la construction ne lisent que le fichier Parquet local.
+    Sans pyarrow, le CSV est lu et préparé directement.
+
+    Args:
+        compact_lists (bool): Garder les colonnes de listes au format Arrow compact
+            (offsets int32 et codes d'un vocabulaire) plutôt qu'en listes Python
+
+    Returns:
+        pd.DataFrame: Catalogue préparé
+    """
+    data_path = ensure_snapshot(source, prepare, name, directory, prepare_version, on_refresh)
+    if data_path is None:
+        return prepare(pd.read_csv(source))
+    return _read(data_path, compact_lists)
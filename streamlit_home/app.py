@@ -1,7 +1,12 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import *
 from auth import auth_component, sidebar_favorites
+from util import load_movie_data, list_column
+from recommendation.index import FEATURE_WEIGHTS, YEAR_WEIGHT
 import streamlit as st
-import pandas as pd
 
 # Configuration de la page
 st.set_page_config(
@@ -9,30 +14,6 @@ st.set_page_config(
     page_icon="🎥",
     layout="wide",
 )
-# Chargement des données
-@st.cache_data
-def load_movie_data(file_path=CSV_URL):
-    try:
-        df = pd.read_csv(file_path)
-        
-        # Renommer les colonnes
-        df = df.rename(columns=COLUMN_MAPPING)
-        
-        # Traiter les colonnes de type liste
-        list_columns = ['genres', 'actors', 'countries', 'languages', 'keywords', 'companies']
-        for col in list_columns:
-            df[col] = df[col].str.split(', ')
-        
-        # Traiter les données numériques
-        df['release_year'] = pd.to_datetime(df['release_date']).dt.year
-        df['box_office_millions'] = pd.to_numeric(df['box_office'], errors='coerce') / 1_000_000
-        df['budget_millions'] = pd.to_numeric(df['budget'], errors='coerce') / 1_000_000
-        df['average_rating'] = (df['tmdb_rating'].astype(float) + df['imdb_rating'].astype(float)) / 2
-        
-        return df
-    except Exception as e:
-        st.error(f"Erreur lors du chargement des données : {str(e)}")
-        return pd.DataFrame()
 
 def format_number(number):
     try:
@@ -51,7 +32,7 @@ def calculate_stats(df):
     try:
         stats = {
             "films": len(df),
-            "genres": len(set([genre for genres in df['genres'] for genre in genres])),
+            "genres": len(list_column(df, 'genres').labels()),
             "votes": df['imdb_votes'].sum() + df['tmdb_votes'].sum()
         }
         return {k: format_number(v) for k, v in stats.items()}
@@ -125,12 +106,13 @@ def render_technology_section():
                 """)
             
             # Utilisation de progress bars pour visualiser les poids
-            st.markdown("##### Poids des critères dans l'analyse")
-            st.progress(0.4, "📚 Genres (40%)")
-            st.progress(0.2, "🔑 Mots-clés (20%)")
-            st.progress(0.15, "🎬 Réalisateur (15%)")
-            st.progress(0.15, "🎭 Acteurs (15%)")
-            st.progress(0.1, "📝 Synopsis (10%)")
+            st.markdown("##### Poids par défaut des critères dans l'analyse")
+            for feature, weight in FEATURE_WEIGHTS.items():
+                st.progress(weight, f"{CRITERIA_LABELS[feature]} ({weight:.0%})")
+            st.caption(
+                f"S'y ajoute la proximité temporelle ({YEAR_WEIGHT:.0%}). "
+                "Tous les poids sont ajustables dans la page Pour Vous."
+            )
 
         with right_col:
             st.markdown("#### 🔬 Technologies Avancées")
@@ -252,7 +234,7 @@ def main():
     st.markdown(COMMON_CSS, unsafe_allow_html=True)
     
     # Charger les données
-    movies_df = load_movie_data()
+    movies_df = load_movie_data(columns=HOME_COLUMNS)
     
     # Authentification
     user_id = auth_component()
@@ -88,7 +88,7 @@ class AuthManager:
         return False
 
     def logout_user(self):
-        for key in ['user_id', 'username', 'favorites']:
+        for key in ['user_id', 'username', 'favorites', 'user_profile']:
             if key in st.session_state:
                 del st.session_state[key]
         st.query_params.clear()()
@@ -138,6 +138,13 @@ class AuthManager:
             if conn:
                 conn.close()
 
+    def get_user_profile(self, user_id):
+        """Profil de recommandation de la session, s'il appartient à cet utilisateur"""
+        profile = st.session_state.get('user_profile')
+        if profile is not None and profile.user_id == user_id:
+            return profile
+        return None
+
     def add_favorite(self, user_id, movie_id):
         try:
             conn = sqlite3.connect(self.db_path)
@@ -145,6 +152,9 @@ class AuthManager:
             c.execute('INSERT OR IGNORE INTO favorites (user_id, movie_id) VALUES (?, ?)',
                      (user_id, str(movie_id)))
             conn.commit()
+            profile = self.get_user_profile(user_id)
+            if profile is not None:
+                profile.add(movie_id)
             return True
         except Exception as e:
             st.error(f"Erreur add_favorite: {e}")
@@ -160,6 +170,9 @@ class AuthManager:
             c.execute('DELETE FROM favorites WHERE user_id = ? AND movie_id = ?',
                      (user_id, str(movie_id)))
             conn.commit()
+            profile = self.get_user_profile(user_id)
+            if profile is not None:
+                profile.remove(movie_id)
         except Exception as e:
             st.error(f"Erreur remove_favorite: {e}")
         finally:
@@ -1,7 +1,23 @@
+import os
 import streamlit as st
 
 # Configuration de base
 CSV_URL = 'https://raw.githubusercontent.com/Lu6asM/film-recommender/refs/heads/main/data/processed/df_movie_cleaned.csv'
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+RECOMMENDER_INDEX_DIR = os.path.join(DATA_DIR, 'recommender_index')
+SNAPSHOT_DIR = os.path.join(DATA_DIR, 'snapshot')
+MOVIE_DATA_VERSION = 2  # À incrémenter quand la préparation du catalogue change (invalide l'instantané)
+ANN_MIN_MOVIES = None  # Taille de catalogue à partir de laquelle la recherche approchée (LSH) est essayée (None : désactivée)
+ANN_MIN_RECALL = 0.9  # Rappel@10 mesuré au démarrage en dessous duquel la recherche exacte est conservée
+RECOMMENDATION_CACHE_SIZE = 4096  # Nombre de résultats de recommandation conservés (LRU)
+CATALOG_CACHE_ENTRIES = 2  # Versions du catalogue dont les index dérivés restent en mémoire (après un rafraîchissement)
+COMPONENT_CACHE_SIZE = 32  # Nombre de films dont les composantes de similarité sont conservées
+COMPONENT_CACHE_BYTES = 128 * 2**20  # Budget mémoire de ces composantes (6 x N float32 par film, ~12 Mo à 500k films)
+SEARCH_RESULTS = 20  # Nombre de titres proposés par la recherche
+# Colonnes chargées par page ; les autres ne sont lues que pour les films affichés
+HOME_COLUMNS = ['title', 'tmdb_id', 'genres', 'imdb_votes', 'tmdb_votes']
+AFFICHE_COLUMNS = ['title', 'tmdb_id', 'average_rating', 'box_office_millions', 'release_year']
+DISCOVER_COLUMNS = ['title', 'tmdb_id', 'genres', 'imdb_rating', 'tmdb_rating', 'runtime', 'decade', 'release_date']
 THEME_COLOR = '#FF5733'
 SECONDARY_COLOR = '#E64A19'
 BACKGROUND_COLOR = '#FFFFFF'
@@ -20,6 +36,16 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Libellés des critères de similarité du système de recommandation
+CRITERIA_LABELS = {
+    'genres': "📚 Genres",
+    'keywords': "🔑 Mots-clés",
+    'director': "🎬 Réalisateur",
+    'actors': "🎭 Acteurs",
+    'overview': "📝 Synopsis",
+    'year': "📅 Proximité temporelle"
+}
+
 # Mapping des colonnes
 COLUMN_MAPPING = {
     'Titre Original': 'title',
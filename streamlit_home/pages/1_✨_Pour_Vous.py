@@ -8,10 +8,16 @@ from util import (
     generate_tmdb_image_url,
     render_main_movie,
     get_movie_by_title, 
+    get_movie_by_id,
+    search_titles,
     get_random_movie,
     load_movie_data,
-    recommend_movies
+    list_column,
+    recommend_movies,
+    recommend_movies_batch,
+    recommend_for_user
 )
+from recommendation.index import FEATURE_WEIGHTS, YEAR_WEIGHT
 import streamlit as st
 import traceback
 
@@ -69,19 +75,70 @@ def main():
             key="num_recommendations_slider"
         )
 
+        # Poids des critères : les recommandations sont re-classées sans recalcul TF-IDF
+        default_weights = {**FEATURE_WEIGHTS, 'year': YEAR_WEIGHT}
+        with st.sidebar.expander("⚖️ Poids des critères"):
+            weights = {
+                component: st.slider(
+                    CRITERIA_LABELS[component],
+                    min_value=0.0,
+                    max_value=1.0,
+                    value=float(default),
+                    step=0.05,
+                    key=f"weight_{component}"
+                )
+                for component, default in default_weights.items()
+            }
+            explain = st.checkbox(
+                "🔍 Expliquer les recommandations",
+                help="Affiche la contribution de chaque critère au score de similarité",
+                key="explain_recommendations"
+            )
+
+        diversity = st.sidebar.slider(
+            "🎲 Diversité des recommandations",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.0,
+            step=0.1,
+            help="Écarte les quasi-doublons (suites, même réalisateur) au profit de films plus variés",
+            key="diversity_slider"
+        )
+
+        # Mode personnalisé à partir des favoris
+        reco_mode = "Film de référence"
+        if user_id and st.session_state.get('favorites'):
+            reco_mode = st.sidebar.radio(
+                "Recommandations basées sur",
+                ["Film de référence", "Mes favoris"],
+                key="reco_mode_selector"
+            )
+
         # Sélection du film avec la bonne langue
-        titles = movies_df['title_fr'] if title_lang == "Titre Français" else movies_df['title']
-        titles = titles.dropna().sort_values().unique().tolist()
-        
-        # Trouver le titre correspondant au film actuel dans la langue sélectionnée
-        current_movie = movies_df[movies_df['tmdb_id'] == st.session_state.selected_movie_id].iloc[0]
-        default_title = current_movie['title_fr'] if title_lang == "Titre Français" else current_movie['title']
-        
-        reference_movie = st.selectbox(
+        title_column = 'title_fr' if title_lang == "Titre Français" else 'title'
+
+        current_movie = get_movie_by_id(movies_df, st.session_state.selected_movie_id)
+
+        # Recherche côté serveur : seuls les meilleurs résultats sont envoyés au navigateur
+        query = st.text_input(
+            "🔍 Rechercher un film",
+            placeholder="Titre original ou français, accents facultatifs",
+            key="movie_search"
+        )
+        matches = [movies_df.iloc[position] for position in search_titles(movies_df, query)] if query else []
+
+        # Options identifiées par leur tmdb_id : les films homonymes (remakes) restent distincts
+        labels = {}
+        for movie in [current_movie] + matches:
+            title = movie[title_column] if isinstance(movie[title_column], str) else movie['title']
+            labels.setdefault(movie['tmdb_id'], f"{title} ({movie['release_year']})")
+
+        reference_id = st.selectbox(
             "Choisir un film",
-            options=titles,
-            index=titles.index(default_title) if default_title in titles else 0,
-            key="movie_selector"
+            options=list(labels),
+            index=0,
+            format_func=labels.get,
+            key=f"movie_selector_{current_movie['tmdb_id']}"
         )
 
         # Ajouter un bouton pour obtenir un nouveau film aléatoire
@@ -92,11 +149,9 @@ def main():
             st.rerun()
 
         # Gérer la sélection manuelle d'un film
-        if reference_movie != default_title:
-            selected = get_movie_by_title(movies_df, reference_movie, title_lang)
-            if selected is not None:
-                st.session_state.selected_movie_id = selected['tmdb_id']
-                st.session_state.selected_movie = None
+        if reference_id != current_movie['tmdb_id']:
+            st.session_state.selected_movie_id = reference_id
+            st.session_state.selected_movie = None
 
         # Gérer la sélection via sidebar ou "Watch Now"
         if st.session_state.selected_movie is not None:
@@ -111,16 +166,55 @@ def main():
             st.session_state.selected_movie = None
 
         # Afficher le film et les recommandations
-        current_movie = movies_df[movies_df['tmdb_id'] == st.session_state.selected_movie_id].iloc[0]
+        current_movie = get_movie_by_id(movies_df, st.session_state.selected_movie_id)
         render_main_movie(current_movie, title_lang)
         
+        # Filtres appliqués directement aux recommandations
+        with st.expander("🎯 Filtrer les recommandations"):
+            filter_cols = st.columns(4)
+            with filter_cols[0]:
+                genres = st.multiselect(
+                    "Genres",
+                    options=list_column(movies_df, 'genres').labels(),
+                    placeholder="Choisissez des genres...",
+                    key="reco_genres"
+                )
+            with filter_cols[1]:
+                note_min = st.slider("Note minimale", min_value=0.0, max_value=10.0, value=0.0, step=0.5, format="%g/10", key="reco_note_min")
+            with filter_cols[2]:
+                decades = [""] + sorted(movies_df['decade'].dropna().unique().tolist())
+                decennie = st.selectbox(
+                    "Décennie",
+                    options=decades,
+                    format_func=lambda x: "Toutes les décennies" if x == "" else x,
+                    key="reco_decade"
+                )
+            with filter_cols[3]:
+                max_runtime = int(movies_df['runtime'].max())
+                duree_max = st.slider("Durée maximale", min_value=0, max_value=max_runtime, value=max_runtime, step=30, format="%g min", key="reco_duree_max")
+
+        filters = {
+            'genres': genres or None,
+            'note_min': note_min,
+            'decennie': decennie or None,
+            'duree_max': duree_max if duree_max < max_runtime else None
+        }
+
         # Calculer et afficher les recommandations
-        recommended_movies = recommend_movies(current_movie['title'], movies_df, num_recommendations)
+        if reco_mode == "Mes favoris":
+            recommended_movies = recommend_for_user(movies_df, user_id, st.session_state.favorites, num_recommendations, **filters)
+            section_title = "Recommandé pour vous d'après vos favoris"
+        else:
+            recommended_movies = recommend_movies(
+                current_movie['title'], movies_df, num_recommendations, weights=weights, explain=explain,
+                mmr_lambda=1 - diversity if diversity else None, tmdb_id=current_movie['tmdb_id'], **filters
+            )
+            section_title = "Films similaires recommandés"
         
         st.markdown("---")
-        st.markdown("""
+        st.markdown(f"""
             <div style='padding: 20px 0;'>
-                <h2>Films similaires recommandés</h2>
+                <h2>{section_title}</h2>
                 <div style='margin: 30px 0;'></div>
             </div>
         """, unsafe_allow_html=True)
@@ -157,9 +251,17 @@ def main():
                         # Le rendre invisible avec du CSS
                         args=('style', 'display: none;')
                     ):
-                        st.session_state.selected_movie = movie['title']
+                        st.session_state.selected_movie_id = movie['tmdb_id']
                         st.rerun()
                     
+                    # Pourquoi ce film est recommandé : contribution de chaque critère au score
+                    if 'genres_contribution' in movie:
+                        with st.expander("Pourquoi ?"):
+                            for component, label in CRITERIA_LABELS.items():
+                                contribution = float(movie[f'{component}_contribution'])
+                                share = contribution / movie['similarity_score'] if movie['similarity_score'] > 0 else 0
+                                st.progress(min(max(share, 0.0), 1.0), f"{label} : {contribution:.3f}")
+
                     # Bouton favori en bas
                     favorite_button(
                         movie['tmdb_id'],
@@ -168,6 +270,26 @@ def main():
                         f"{i}_{j}"
                     )
 
+        # Recommandations "Parce que vous avez aimé" pour chaque favori
+        favorites = st.session_state.get('favorites') if user_id else None
+        if favorites:
+            st.markdown("---")
+            st.markdown("## ❤️ Parce que vous avez aimé")
+            favorite_recommendations = recommend_movies_batch(favorites, movies_df, k=5)
+
+            for favorite_id, recommendations in favorite_recommendations.items():
+                favorite_movie = get_movie_by_id(movies_df, favorite_id)
+                if favorite_movie is None:
+                    continue
+                favorite_title = favorite_movie['title_fr'] if title_lang == "Titre Français" else favorite_movie['title']
+                with st.expander(f"{favorite_title} ({favorite_movie['release_year']})"):
+                    cols = st.columns(5)
+                    for col, (_, movie) in zip(cols, recommendations.iterrows()):
+                        with col:
+                            display_title = movie['title_fr'] if title_lang == "Titre Français" else movie['title']
+                            st.image(generate_tmdb_image_url(movie['poster_path'], size='w185'), use_container_width=True)
+                            st.caption(f"{display_title} ({movie['release_year']})")
+
                         
     
     except Exception as e:
@@ -4,7 +4,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import *
 from auth import auth_component, sidebar_favorites
-from util import render_main_movie, load_movie_data
+from util import render_main_movie, load_movie_data, load_movie_rows, list_column
 import streamlit as st
 import traceback
 
@@ -21,7 +21,7 @@ def main():
         st.markdown(COMMON_CSS, unsafe_allow_html=True)
         
         # Chargement des données
-        movies_df = load_movie_data()
+        movies_df = load_movie_data(columns=DISCOVER_COLUMNS)
         
         # Authentification
         user_id = auth_component()
@@ -44,7 +44,7 @@ def main():
         with col1:
             genres = st.multiselect(
                 "Genres",
-                options=sorted(set([genre for genres in movies_df['genres'] for genre in genres])),
+                options=list_column(movies_df, 'genres').labels(),
                 placeholder="Choisissez des genres...",
                 help="Sélectionnez un ou plusieurs genres"
             )
@@ -124,7 +124,7 @@ def main():
         
         # Application des filtres
         if genres:
-            filtered_df = filtered_df[filtered_df['genres'].apply(lambda x: any(genre in x for genre in genres))]
+            filtered_df = filtered_df[list_column(filtered_df, 'genres').contains_any(genres)]
         
         filtered_df = filtered_df[
             (filtered_df['imdb_rating'] >= note_min) &
@@ -142,7 +142,7 @@ def main():
             filtered_df = filtered_df.sort_values(by=sort_column, ascending=ascending)
             
             # Limitation du nombre de films et affichage
-            limited_df = filtered_df.head(nb_films)
+            limited_df = load_movie_rows(filtered_df.head(nb_films))
             for _, movie in limited_df.iterrows():
                 render_main_movie(movie, title_lang='fr')
         else:
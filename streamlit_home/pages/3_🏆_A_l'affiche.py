@@ -7,6 +7,7 @@ from auth import auth_component, sidebar_favorites, favorite_button
 from util import (
     render_movie_with_rank,
     load_movie_data,
+    load_movie_rows,
 )
 import streamlit as st
 import traceback
@@ -23,7 +24,7 @@ def main():
     try:
         # Chargement CSS et données
         st.markdown(COMMON_CSS, unsafe_allow_html=True)
-        movies_df = load_movie_data()
+        movies_df = load_movie_data(columns=AFFICHE_COLUMNS)
 
         # Authentification
         user_id = auth_component()
@@ -65,7 +66,8 @@ def main():
 
         # Affichage des films
         st.info(f"📽️ Top {nombre_films} des films triés par {tri_choix}")
-        for rank, (_, movie) in enumerate(sorted_df.head(nombre_films).iterrows(), 1):
+        top_df = load_movie_rows(sorted_df.head(nombre_films))
+        for rank, (_, movie) in enumerate(top_df.iterrows(), 1):
             render_movie_with_rank(movie=movie, title_lang='fr', rank=rank)
 
     except Exception as e:
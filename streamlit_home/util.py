@@ -1,24 +1,69 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 from config import *
 from auth import auth_component, sidebar_favorites, favorite_button
+from recommendation.index import (
+    RecommenderIndex, COMPONENTS, row_hashes, catalog_version, weight_vector, is_default_weights,
+    find_position, recommend_positions, recommend_batch
+)
+from recommendation.selection import select_top_k
+from recommendation.diversity import diversify, DEFAULT_POOL_SIZE
+from recommendation.lookup import CatalogLookup
+from recommendation.search import TitleSearch
+from recommendation.snapshot import ensure_snapshot
+from recommendation.catalog import read_only, parse_actors, actor_lists, ListColumn, LazyCatalog
+from recommendation.embeddings import EmbeddingIndex
+from recommendation.neighbors import NeighborTable
+from recommendation.ann import LSHIndex, calibrate
+from recommendation.profile import UserProfile
+from recommendation.filters import CatalogFilters
+from recommendation.cache import RecommendationCache
 import streamlit as st
 import pandas as pd
 import numpy as np
 import requests
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
 
 # Fonctions de données et de recherche
+def catalog_key(movies_df):
+    """
+    Version du catalogue dont provient un DataFrame (voir LazyCatalog).
+
+    Les caches dérivés du catalogue la reçoivent en argument : Streamlit ne
+    hache pas les arguments préfixés par « _ », et sans elle un index construit
+    avant un rafraîchissement de l'instantané serait servi au nouveau catalogue.
+    """
+    return movies_df.attrs.get('catalog_version')
+
 def get_movie_by_title(movies_df, title, title_lang):
     """Recherche un film par son titre en tenant compte de la langue sélectionnée"""
-    if title_lang == "Titre Français":
-        filtered_df = movies_df[movies_df['title_fr'] == title]
-        if not filtered_df.empty:
-            return filtered_df.iloc[0]
-    else:  # Titre Original
-        filtered_df = movies_df[movies_df['title'] == title]
-        if not filtered_df.empty:
-            return filtered_df.iloc[0]
-    return None
+    column = 'title_fr' if title_lang == "Titre Français" else 'title'
+    position = get_catalog_lookup(movies_df, catalog_key(movies_df)).by_title(title, column)
+    return movies_df.iloc[position] if position is not None else None
+
+def get_movie_by_id(movies_df, tmdb_id):
+    """Recherche un film par son identifiant TMDb"""
+    position = get_catalog_lookup(movies_df, catalog_key(movies_df)).by_tmdb_id(tmdb_id)
+    return movies_df.iloc[position] if position is not None else None
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_title_search(_movies_df, version):
+    """Moteur de recherche sur les titres originaux et français, construit une fois par version du catalogue"""
+    return TitleSearch(_movies_df)
+
+def search_titles(movies_df, query, k=SEARCH_RESULTS):
+    """Positions des films dont le titre correspond le mieux à la saisie (accents et fautes tolérés)"""
+    return get_title_search(movies_df, catalog_key(movies_df)).search(query, k)
+
+def list_column(df, column):
+    """Vue NumPy (offsets, codes, vocabulaire) d'une colonne de listes, sans copie des données"""
+    return ListColumn.from_series(df[column])
+
+def movie_list(movie, column):
+    """Valeurs d'une colonne de listes pour un film (liste vide si absente)"""
+    values = movie[column]
+    return list(values) if isinstance(values, (list, tuple, np.ndarray)) else []
 
 def get_random_movie(movies_df):
     """Sélectionne un film aléatoire dans le DataFrame"""
@@ -29,7 +74,7 @@ def recherche_films(df, genres=None, note_min=0, decennie=None, duree_max=None):
     filtered_df = df.copy()
     
     if genres:
-        filtered_df = filtered_df[filtered_df['genres'].apply(lambda x: any(genre in x for genre in genres))]
+        filtered_df = filtered_df[list_column(filtered_df, 'genres').contains_any(genres)]
     
     if note_min > 0:
         filtered_df = filtered_df[
@@ -107,97 +152,260 @@ def parse_actor_info(actor_list):
     """Parse les informations des acteurs"""
     if not isinstance(actor_list, str):
         return []
-        
-    actors = []
-    for actor in actor_list.split(', '):
-        try:
-            name_part = actor.split(' (')
-            if len(name_part) == 2:
-                name = name_part[0]
-                role = name_part[1].rstrip(')')
-                actors.append((name, role))
-            else:
-                actors.append((actor, ""))
-        except:
-            continue
-    return actors
+    return actor_lists(*parse_actors(pd.Series([actor_list])))[0]
 
 # Chargement et préparation des données
-@st.cache_data
-def load_movie_data(file_path=CSV_URL):
-    """Charge et prépare les données des films"""
+def prepare_movie_data(df):
+    """Prépare le CSV brut des films (colonnes renommées, listes découpées, années)"""
+    # Renommer les colonnes
+    df = df.rename(columns=COLUMN_MAPPING)
+
+    # Traiter les colonnes de type liste
+    list_columns = ['genres', 'countries', 'languages', 'keywords', 'companies']
+    for col in list_columns:
+        df[col] = df[col].str.split(', ')
+
+    # Traitement spécial pour les acteurs : une passe vectorisée sur tout le catalogue
+    df['actors'] = actor_lists(*parse_actors(df['actors']))
+
+    # Traiter les données numériques
+    df['release_year'] = pd.to_datetime(df['release_date']).dt.year
+    df['box_office_millions'] = pd.to_numeric(df['box_office'], errors='coerce') / 1_000_000
+    df['budget_millions'] = pd.to_numeric(df['budget'], errors='coerce') / 1_000_000
+    df['average_rating'] = (df['tmdb_rating'].astype(float) + df['imdb_rating'].astype(float)) / 2
+
+    return df
+
+def catalog_snapshot(file_path=CSV_URL):
+    """
+    Chemin de l'instantané Parquet du catalogue, construit si besoin.
+
+    Appelé à chaque chargement, hors du cache : cette vérification (un stat et
+    la lecture des métadonnées) programme le rafraîchissement en arrière-plan,
+    qui vide load_catalog une fois l'instantané remplacé.
+    """
+    return ensure_snapshot(
+        file_path, prepare_movie_data, name='movies', directory=SNAPSHOT_DIR, prepare_version=MOVIE_DATA_VERSION,
+        on_refresh=load_catalog.clear
+    )
+
+@st.cache_resource
+def load_catalog(file_path=CSV_URL):
+    """
+    Catalogue du processus, adossé à l'instantané Parquet local rafraîchi en arrière-plan.
+
+    Partagé sans copie par toutes les pages et toutes les sessions : chaque
+    colonne n'est lue qu'à la première page qui en a besoin, en lecture seule,
+    et les colonnes de listes restent au format Arrow compact (voir list_column).
+    """
+    path = catalog_snapshot(file_path)
+    if path is None:
+        return LazyCatalog.from_frame(read_only(prepare_movie_data(pd.read_csv(file_path))))
+    return LazyCatalog(path)
+
+def load_movie_data(file_path=CSV_URL, columns=None):
+    """Charge les colonnes demandées du catalogue partagé (toutes par défaut)"""
     try:
-        df = pd.read_csv(file_path)
-        
-        # Renommer les colonnes
-        df = df.rename(columns=COLUMN_MAPPING)
-        
-        # Traiter les colonnes de type liste
-        list_columns = ['genres', 'countries', 'languages', 'keywords', 'companies']
-        for col in list_columns:
-            df[col] = df[col].str.split(', ')
-
-        # Traitement spécial pour les acteurs
-        df['actors'] = df['actors'].apply(parse_actor_info)
-        
-        # Traiter les données numériques
-        df['release_year'] = pd.to_datetime(df['release_date']).dt.year
-        df['box_office_millions'] = pd.to_numeric(df['box_office'], errors='coerce') / 1_000_000
-        df['budget_millions'] = pd.to_numeric(df['budget'], errors='coerce') / 1_000_000
-        df['average_rating'] = (df['tmdb_rating'].astype(float) + df['imdb_rating'].astype(float)) / 2
-        
-        return df
+        catalog_snapshot(file_path)
+        return load_catalog(file_path).frame(columns)
     except Exception as e:
         st.error(f"Erreur lors du chargement des données : {str(e)}")
         return pd.DataFrame()
 
+def load_movie_rows(movies_df, file_path=CSV_URL):
+    """Lignes complètes (synopsis, acteurs, affiche...) des seuls films à afficher"""
+    return load_catalog(file_path).rows(movies_df.index)
+
 # Système de recommandation
-@st.cache_data
-def recommend_movies(movie_title, movies_df, k=5):
-    """Système de recommandation de films"""
-    with st.spinner("Calcul des recommandations en cours..."):
-        feature_mapping = {
-            'genres': 0.4,
-            'keywords': 0.2, 
-            'director': 0.15,
-            'actors': 0.15,
-            'overview': 0.1
-        }
-
-        if movie_title not in movies_df['title'].values:
-            raise ValueError(f"Le film '{movie_title}' n'est pas dans la base de données.")
-
-        ref_movie = movies_df[movies_df['title'] == movie_title].iloc[0]
-        combined_similarity = np.zeros(len(movies_df))
-        
-        for feature, weight in feature_mapping.items():
-            if feature not in movies_df.columns:
-                continue
-
-            vectorizer = TfidfVectorizer(token_pattern=r'\b\w+\b')
-            
-            def process_feature(data):
-                if isinstance(data, list):
-                    return ' '.join(map(str, data))
-                return str(data)
-
-            feature_data = movies_df[feature].apply(process_feature).fillna('')
-            feature_matrix = vectorizer.fit_transform(feature_data)
-            ref_vector = vectorizer.transform([process_feature(ref_movie[feature])])
-            similarity = cosine_similarity(ref_vector, feature_matrix)[0]
-            
-            combined_similarity += similarity * weight
-
-        year_diff = abs(pd.to_datetime(movies_df['release_date']).dt.year - 
-                       pd.to_datetime(ref_movie['release_date']).year)
-        year_score = 1 / (1 + year_diff)
-        combined_similarity += year_score * 0.1
-
-        movie_indices = combined_similarity.argsort()[::-1][1:k+1]
-        recommended_films = movies_df.iloc[movie_indices].copy()
-        recommended_films['similarity_score'] = combined_similarity[movie_indices]
-        
-        return recommended_films.sort_values('similarity_score', ascending=False)
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_row_hashes(_movies_df, version):
+    """Empreintes des films, calculées une fois par version du catalogue (version des index)"""
+    return row_hashes(_movies_df)
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_recommender_index(_movies_df, version):
+    """
+    Charge l'index de recommandation pré-calculé.
+
+    Les embeddings denses mappés en mémoire sont utilisés s'ils ont été construits
+    pour ce catalogue ; sinon l'index TF-IDF est chargé (ou reconstruit).
+    """
+    hashes = get_row_hashes(_movies_df, version)
+    embeddings = EmbeddingIndex.load(RECOMMENDER_INDEX_DIR, version=catalog_version(hashes=hashes))
+    if embeddings is not None:
+        return embeddings
+    return RecommenderIndex.load_or_build(_movies_df, RECOMMENDER_INDEX_DIR, hashes=hashes)
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_neighbor_table(version):
+    """Charge la table des voisins pré-calculée hors ligne si elle correspond à cette version de l'index"""
+    return NeighborTable.load(RECOMMENDER_INDEX_DIR, version=version)
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_ann_index(_index, version):
+    """
+    Index approché (LSH), sur demande (ANN_MIN_MOVIES) et pour les grands catalogues uniquement.
+
+    n_probes est calibré sur un échantillon du catalogue : si aucun réglage
+    n'atteint ANN_MIN_RECALL en restant plus rapide que la recherche exacte,
+    la recherche exacte est conservée.
+    """
+    if ANN_MIN_MOVIES is None or not isinstance(_index, RecommenderIndex) or len(_index) < ANN_MIN_MOVIES:
+        return None
+    lsh = LSHIndex(_index)
+    lsh.n_probes = calibrate(_index, lsh, min_recall=ANN_MIN_RECALL)
+    return lsh if lsh.n_probes is not None else None
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_catalog_filters(_movies_df, version):
+    """Pré-calcule les colonnes de filtrage du catalogue"""
+    return CatalogFilters(_movies_df)
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_catalog_lookup(_movies_df, version):
+    """Index de recherche par identifiant et par titre, construit une fois par version du catalogue (sans l'index TF-IDF)"""
+    return CatalogLookup(_movies_df)
+
+@st.cache_resource(max_entries=CATALOG_CACHE_ENTRIES)
+def get_feature_index(_movies_df, version):
+    """Index TF-IDF par critère, nécessaire pour recombiner des poids personnalisés"""
+    index = get_recommender_index(_movies_df, version)
+    if isinstance(index, RecommenderIndex):
+        return index
+    return RecommenderIndex.load_or_build(_movies_df, RECOMMENDER_INDEX_DIR, hashes=get_row_hashes(_movies_df, version))
+
+@st.cache_resource
+def get_recommendation_cache():
+    """Cache LRU des recommandations, partagé par toutes les sessions"""
+    return RecommendationCache(RECOMMENDATION_CACHE_SIZE)
+
+@st.cache_resource
+def get_component_cache():
+    """Cache LRU des composantes de similarité par film de référence, borné en mémoire"""
+    return RecommendationCache(COMPONENT_CACHE_SIZE, maxbytes=COMPONENT_CACHE_BYTES)
+
+def get_feature_similarities(movies_df, position):
+    """Composantes de similarité d'un film (une ligne par critère), calculées une fois"""
+    index = get_feature_index(movies_df, catalog_key(movies_df))
+    cache = get_component_cache()
+    key = (index.version, position)
+    components = cache.get(key)
+    if components is None:
+        components = index.feature_similarities(position)
+        cache.put(key, components)
+    return components
+
+def recommend_movies(movie_title, movies_df, k=5, genres=None, note_min=0, decennie=None, duree_max=None, weights=None, explain=False, mmr_lambda=None, tmdb_id=None):
+    """
+    Système de recommandation de films, avec les mêmes filtres que la page Découvrir.
+
+    Des poids personnalisés ({critère ou 'year': poids}) sont recombinés à partir
+    des composantes de similarité mises en cache, sans nouveau calcul TF-IDF.
+    Avec explain=True, la contribution pondérée de chaque critère au score est
+    ajoutée en colonnes '<critère>_contribution', lues dans les mêmes composantes
+    que le score. Avec mmr_lambda, les DEFAULT_POOL_SIZE meilleurs candidats sont
+    re-classés par MMR pour écarter les quasi-doublons (suites, même réalisateur).
+    Avec tmdb_id, le film de référence est celui-ci, même si d'autres films
+    portent le même titre (remakes).
+    """
+    version = catalog_key(movies_df)
+    index = get_recommender_index(movies_df, version)
+    lookup = get_catalog_lookup(movies_df, version)
+    position = lookup.by_tmdb_id(tmdb_id) if tmdb_id is not None else None
+    if position is None:
+        position = find_position(movies_df, movie_title, lookup=lookup)
+
+    # Clé légère : le catalogue est identifié par ses versions, jamais re-haché. Celle de
+    # l'index ne couvre que les critères textuels ; celle de l'instantané couvre aussi
+    # les notes, durées et décennies utilisées par les filtres
+    weight_key = tuple(weight_vector(weights).tolist())
+    filters = (tuple(sorted(genres or ())), note_min, decennie, duree_max)
+    key = (index.version, version, str(movies_df['tmdb_id'].iat[position]), k, weight_key, filters, explain, mmr_lambda)
+
+    cache = get_recommendation_cache()
+    result = cache.get(key)
+    if result is None:
+        with st.spinner("Calcul des recommandations en cours..."):
+            mask = get_catalog_filters(movies_df, version).mask(genres, note_min, decennie, duree_max)
+            n_candidates = k if mmr_lambda is None else max(k, DEFAULT_POOL_SIZE)
+            if is_default_weights(weights) and not explain:
+                neighbors = get_neighbor_table(index.version)
+                ann = get_ann_index(index, index.version)
+                result = recommend_positions(index, position, n_candidates, neighbors=neighbors, ann=ann, mask=mask)
+            else:
+                components = get_feature_similarities(movies_df, position)
+                component_weights = weight_vector(weights)
+                combined_similarity = component_weights @ components
+                top, top_scores = select_top_k(combined_similarity, n_candidates, exclude=position, mask=mask)
+                result = (top, top_scores, components[:, top] * component_weights[:, None])
+
+            if mmr_lambda is not None:
+                order = diversify(index, result[0], result[1], k, mmr_lambda)
+                result = (result[0][order], result[1][order]) + tuple(extra[:, order] for extra in result[2:])
+        cache.put(key, result)
+
+    movie_indices, scores = result[:2]
+    recommended_films = movies_df.iloc[movie_indices].copy()
+    recommended_films['similarity_score'] = scores
+    if explain:
+        for component, contributions in zip(COMPONENTS, result[2]):
+            recommended_films[f'{component}_contribution'] = contributions
+    return recommended_films
+
+def get_user_profile(movies_df, user_id, favorites):
+    """
+    Profil de l'utilisateur connecté, conservé dans la session.
+
+    Il est construit une fois à partir des favoris puis mis à jour de façon
+    incrémentale par AuthManager.add_favorite / remove_favorite.
+    """
+    version = catalog_key(movies_df)
+    index = get_recommender_index(movies_df, version)
+    profile = st.session_state.get('user_profile')
+    if profile is None or profile.user_id != user_id or profile.version != index.version:
+        profile = UserProfile(index, get_catalog_lookup(movies_df, version).tables['tmdb_id'], user_id=user_id)
+        for tmdb_id in favorites:
+            profile.add(tmdb_id)
+        st.session_state.user_profile = profile
+    return profile
+
+def recommend_for_user(movies_df, user_id, favorites, k=10, genres=None, note_min=0, decennie=None, duree_max=None):
+    """Recommandations personnalisées à partir du profil des favoris"""
+    profile = get_user_profile(movies_df, user_id, favorites)
+    mask = get_catalog_filters(movies_df, catalog_key(movies_df)).mask(genres, note_min, decennie, duree_max)
+    movie_indices, scores = profile.recommend(k, mask=mask)
+    recommended_films = movies_df.iloc[movie_indices].copy()
+    recommended_films['similarity_score'] = scores
+    return recommended_films
+
+def recommend_movies_batch(tmdb_ids, movies_df, k=5):
+    """
+    Recommandations pour plusieurs films (ex. tous les favoris) en une seule passe.
+
+    Chaque film est mis en cache séparément : ajouter un favori ne recalcule
+    que celui-ci, et un simple rerun ne recalcule rien.
+    """
+    version = catalog_key(movies_df)
+    index = get_recommender_index(movies_df, version)
+    cache = get_recommendation_cache()
+    keys = {tmdb_id: (index.version, 'batch', str(tmdb_id), k) for tmdb_id in tmdb_ids}
+    results = {tmdb_id: cache.get(key) for tmdb_id, key in keys.items()}
+
+    missing = [tmdb_id for tmdb_id, result in results.items() if result is None]
+    if missing:
+        neighbors = get_neighbor_table(index.version)
+        computed = recommend_batch(
+            index, movies_df, tmdb_ids=missing, k=k, neighbors=neighbors, lookup=get_catalog_lookup(movies_df, version)
+        )
+        # Le cache garde les positions et les scores, pas les DataFrames
+        for tmdb_id, result in computed.items():
+            cache.put(keys[tmdb_id], result)
+        results.update(computed)
+
+    return {
+        tmdb_id: movies_df.iloc[result[0]].assign(similarity_score=result[1])
+        for tmdb_id, result in results.items() if result is not None
+    }
 
 # Fonctions de rendu
 def render_cast_section(movie):
@@ -239,7 +447,7 @@ def render_cast_section(movie):
         """, unsafe_allow_html=True)
 
     # Acteurs
-    actors = movie['actors'][:4] if isinstance(movie['actors'], list) else []
+    actors = movie_list(movie, 'actors')[:4]
     for idx, (actor, role) in enumerate(actors):
         with cast_cols[idx + 2]:
             actor_id = get_person_id(actor)
@@ -278,7 +486,7 @@ def render_movie_with_rank(movie, title_lang, rank: int):
         info_cols = st.columns(2)
         with info_cols[0]:
             st.markdown(f"**Durée :** {format_duration(movie['runtime'])}")
-            st.markdown(f"**Genre(s) :** {', '.join(movie['genres'])}")
+            st.markdown(f"**Genre(s) :** {', '.join(movie_list(movie, 'genres'))}")
         
         with info_cols[1]:
             st.markdown(f"**Budget :** {format_currency(movie['budget_millions'])}")
@@ -353,7 +561,7 @@ def render_main_movie(movie, title_lang):
         info_cols = st.columns(2)
         with info_cols[0]:
             st.markdown(f"**Durée :** {format_duration(movie['runtime'])}")
-            st.markdown(f"**Genre(s) :** {', '.join(movie['genres'])}")
+            st.markdown(f"**Genre(s) :** {', '.join(movie_list(movie, 'genres'))}")
         
         with info_cols[1]:
             st.markdown(f"**Budget :** {format_currency(movie['budget_millions'])}")
@@ -1,21 +1,36 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import seaborn as sns
 import matplotlib.pyplot as plt
 import numpy as np
+from recommendation.snapshot import ensure_snapshot, load_snapshot
+
+CSV_URL = "https://raw.githubusercontent.com/Lu6asM/film-recommender/refs/heads/main/data/processed/df_movie_cleaned.csv"
+
+def prepare_data(df):
+    """Découpe les colonnes de type liste du CSV brut"""
+    df["Genres"] = df["Genres"].apply(lambda x: x.split(",") if isinstance(x, str) else x)
+    df["Réalisateur(s)"] = df["Réalisateur(s)"].apply(lambda x: x.split(",") if isinstance(x, str) else x)
+    df["Acteurs"] = df["Acteurs"].apply(lambda x: x.split(",") if isinstance(x, str) else x)
+    return df
 
-# Fonction pour charger les donnéesd
 @st.cache_data
+def read_data():
+    """Lit l'instantané Parquet local (vidé quand l'instantané est remplacé)"""
+    return load_snapshot(CSV_URL, prepare_data, name='movies_viz')
+
+# Fonction pour charger les donnéesd
 def load_data():
     try:
-        url = "https://raw.githubusercontent.com/Lu6asM/film-recommender/refs/heads/main/data/processed/df_movie_cleaned.csv"
-        df = pd.read_csv(url)
-        # Application des transformations sur les colonnes
-        df["Genres"] = df["Genres"].apply(lambda x: x.split(",") if isinstance(x, str) else x)
-        df["Réalisateur(s)"] = df["Réalisateur(s)"].apply(lambda x: x.split(",") if isinstance(x, str) else x)
-        df["Acteurs"] = df["Acteurs"].apply(lambda x: x.split(",") if isinstance(x, str) else x)
-        return df
+        # Instantané Parquet local, rafraîchi en arrière-plan si le CSV distant change :
+        # la vérification a lieu à chaque chargement, hors du cache
+        ensure_snapshot(CSV_URL, prepare_data, name='movies_viz', on_refresh=read_data.clear)
+        return read_data()
     except FileNotFoundError:
         st.error("Le fichier 'df_movie_cleaned.csv' est introuvable.")
         st.stop()
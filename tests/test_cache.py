@@ -0,0 +1,28 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from recommendation.cache import RecommendationCache
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = RecommendationCache(maxsize=10, maxbytes=3 * 4000)
+    for position in range(3):
+        cache.put(('v1', position), np.zeros((2, 500), dtype=np.float32))
+    assert cache.nbytes == 3 * 4000
+
+    cache.get(('v1', 0))
+    cache.put(('v1', 3), (np.zeros(500, dtype=np.int64),))
+    assert cache.get(('v1', 1)) is None
+    assert cache.get(('v1', 0)) is not None
+    assert len(cache) == 3 and cache.nbytes == 3 * 4000
+
+
+def test_oversized_value_is_not_kept():
+    cache = RecommendationCache(maxsize=10, maxbytes=1000)
+    cache.put('small', np.zeros(10, dtype=np.float32))
+    cache.put('small', np.zeros(2000, dtype=np.float32))
+    assert cache.get('small') is None
+    assert len(cache) == 0 and cache.nbytes == 0
@@ -0,0 +1,42 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from recommendation.catalog import LazyCatalog, actor_lists, parse_actors, read_only
+
+
+def test_assignment_never_reaches_the_shared_catalog():
+    prepared = pd.DataFrame({'tmdb_id': [1, 2, 3], 'runtime': [90, 100, 120], 'title': ['Alpha', 'Beta', 'Gamma']})
+    catalog = LazyCatalog.from_frame(read_only(prepared))
+    assert np.shares_memory(catalog.frame()['runtime'].to_numpy(), prepared['runtime'].to_numpy())
+
+    session_df = catalog.frame()
+    session_df.loc[0, 'runtime'] = 1
+    session_df.iloc[1, 2] = 'Changed'
+    assert session_df['runtime'].tolist() == [1, 100, 120]
+    assert catalog.frame()['runtime'].tolist() == [90, 100, 120]
+    assert catalog.frame()['title'].tolist() == ['Alpha', 'Beta', 'Gamma']
+
+
+def test_parse_actors_keeps_commas_and_nested_parentheses_in_roles():
+    actors = pd.Series([
+        'Tom Hanks (Woody (voix)), Tim Allen (Buzz)',
+        'Jon Stewart (Lui-même, présentateur), Stephen Colbert',
+        None,
+        '',
+        'Tom Hanks (Woody (voix, VF)), Annie Potts (Bo Peep), Don Rickles'
+    ], index=[10, 11, 12, 13, 14])
+    table, offsets = parse_actors(actors)
+
+    assert offsets.tolist() == [0, 2, 4, 4, 4, 7]
+    assert actor_lists(table, offsets) == [
+        [('Tom Hanks', 'Woody (voix)'), ('Tim Allen', 'Buzz')],
+        [('Jon Stewart', 'Lui-même, présentateur'), ('Stephen Colbert', '')],
+        [],
+        [],
+        [('Tom Hanks', 'Woody (voix, VF)'), ('Annie Potts', 'Bo Peep'), ('Don Rickles', '')]
+    ]
+    assert table['film'].tolist() == [0, 0, 1, 1, 4, 4, 4]
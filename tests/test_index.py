@@ -0,0 +1,150 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+
+from recommendation.index import (
+    RecommenderIndex, FEATURE_WEIGHTS, YEAR_WEIGHT, TOKEN_PATTERN, process_feature, row_hashes, weight_vector,
+    recommend_batch, recommend_positions
+)
+from recommendation.neighbors import NeighborTable
+from recommendation.selection import select_top_k
+
+
+@pytest.fixture
+def movies_df():
+    """Petit catalogue au format préparé par l'application (acteurs en paires nom / rôle)"""
+    return pd.DataFrame({
+        'tmdb_id': [1, 2, 3, 4, 5, 6],
+        'title': ['Alpha', 'Beta', 'Gamma', 'Delta', 'Epsilon', 'Zeta'],
+        'release_date': ['1999-03-31', '2003-05-15', '1999-11-01', '2010-07-16', None, '1977-05-25'],
+        'genres': [['Action', 'Science Fiction'], ['Action'], ['Drama'], ['Science Fiction', 'Thriller'], ['Drama', 'Romance'], None],
+        'keywords': [['simulation', 'hacker'], ['hacker', 'sequel'], ['prison'], ['dream', 'heist'], ['love'], ['space', 'rebellion']],
+        'director': ['Lana Wachowski', 'Lana Wachowski', 'Frank Darabont', 'Christopher Nolan', None, 'George Lucas'],
+        'actors': [
+            [('Keanu Reeves', 'Neo'), ('Carrie-Anne Moss', 'Trinity')],
+            [('Keanu Reeves', 'Neo')],
+            [('Tim Robbins', 'Andy Dufresne'), ('Morgan Freeman', "Ellis 'Red' Redding")],
+            [('Leonardo DiCaprio', 'Cobb'), ('Elliot Page', '')],
+            [],
+            [('Mark Hamill', 'Luke Skywalker')]
+        ],
+        'overview': [
+            'A hacker learns the world is a simulation.',
+            'The hacker returns to fight the machines.',
+            'Two imprisoned men bond over a number of years.',
+            'A thief steals secrets through dream-sharing technology.',
+            'A love story.',
+            'A farm boy joins the rebellion in space.'
+        ]
+    })
+
+
+def weighted_blend(movies_df, position, weights):
+    """Similarité de référence : un TF-IDF et un cosinus par critère, plus la proximité temporelle"""
+    combined_similarity = np.zeros(len(movies_df))
+    for feature in FEATURE_WEIGHTS:
+        documents = movies_df[feature].apply(process_feature).fillna('')
+        matrix = TfidfVectorizer(token_pattern=TOKEN_PATTERN).fit_transform(documents)
+        combined_similarity += weights[feature] * cosine_similarity(matrix[position], matrix).ravel()
+
+    years = pd.to_datetime(movies_df['release_date']).dt.year.to_numpy(dtype=float)
+    year_scores = np.nan_to_num(1 / (1 + np.abs(years - years[position])))
+    return combined_similarity + weights['year'] * year_scores
+
+
+def test_weighted_features_matches_weighted_blend(movies_df):
+    index = RecommenderIndex.build(movies_df)
+    weights = {**FEATURE_WEIGHTS, 'year': YEAR_WEIGHT}
+    for position in range(len(movies_df)):
+        np.testing.assert_allclose(
+            index.similarities(position), weighted_blend(movies_df, position, weights), rtol=1e-5, atol=1e-6
+        )
+
+
+def test_batch_and_custom_weights_match_weighted_blend(movies_df):
+    index = RecommenderIndex.build(movies_df)
+    positions = np.arange(len(movies_df))
+    expected = np.array([weighted_blend(movies_df, position, {**FEATURE_WEIGHTS, 'year': YEAR_WEIGHT}) for position in positions])
+    np.testing.assert_allclose(index.similarities_batch(positions), expected, rtol=1e-5, atol=1e-6)
+
+    weights = {'genres': 0.1, 'keywords': 0.5, 'director': 0.0, 'actors': 0.3, 'overview': 0.6, 'year': 0.2}
+    np.testing.assert_allclose(
+        weight_vector(weights) @ index.feature_similarities(2), weighted_blend(movies_df, 2, weights), rtol=1e-5, atol=1e-6
+    )
+
+
+def test_row_hashes_ignore_list_formatting(movies_df):
+    # Acteurs en texte « Nom (Rôle) », comme dans le CSV découpé par le script en ligne de commande
+    as_text = movies_df.copy()
+    as_text['actors'] = [[f"{name} ({role})" if role else name for name, role in actors] for actors in movies_df['actors']]
+    np.testing.assert_array_equal(row_hashes(movies_df), row_hashes(as_text))
+
+    changed = movies_df.copy()
+    changed.loc[3, 'overview'] = 'A different synopsis.'
+    assert (row_hashes(movies_df) != row_hashes(changed)).tolist() == [False, False, False, True, False, False]
+
+
+def synthetic_catalog(n_movies, seed=0):
+    """Catalogue aléatoire aux termes partagés entre films"""
+    rng = np.random.default_rng(seed)
+    words = [f"mot{i}" for i in range(40)]
+    people = [f"Personne {i}" for i in range(30)]
+    return pd.DataFrame({
+        'tmdb_id': np.arange(1, n_movies + 1),
+        'title': [f"Film {i}" for i in range(n_movies)],
+        'release_date': [f"{year}-01-01" for year in rng.integers(1950, 2024, n_movies)],
+        'genres': [list(rng.choice(words[:8], 2, replace=False)) for _ in range(n_movies)],
+        'keywords': [list(rng.choice(words, 3, replace=False)) for _ in range(n_movies)],
+        'director': list(rng.choice(people, n_movies)),
+        'actors': [[(name, '') for name in rng.choice(people, 3, replace=False)] for _ in range(n_movies)],
+        'overview': [' '.join(rng.choice(words, 8)) for _ in range(n_movies)]
+    })
+
+
+def test_extend_matches_exact_top_k_after_append():
+    movies_df = synthetic_catalog(120)
+    index = RecommenderIndex.build(movies_df.iloc[:100], hashes=row_hashes(movies_df.iloc[:100]))
+    table = NeighborTable.build(index, k=10)
+
+    index.append(movies_df.iloc[100:], row_hashes(movies_df))
+    extended = table.extend(index, chunk_size=7)
+    assert extended.version == index.version and extended.neighbors.shape == (120, 10)
+
+    for position in range(len(index)):
+        similarities = index.similarities(position)
+        _, exact_scores = select_top_k(similarities, 10, exclude=position)
+        neighbors = extended.neighbors[position]
+        assert position not in neighbors and len(set(neighbors)) == 10
+        # Scores stockés en float16 : les ex æquo peuvent être départagés autrement
+        np.testing.assert_allclose(np.sort(similarities[neighbors])[::-1], exact_scores, atol=2e-3)
+
+
+def test_chained_appends_refit_past_the_ratio(tmp_path):
+    movies_df = synthetic_catalog(130)
+    assert RecommenderIndex.load_or_build(movies_df.iloc[:100], tmp_path).fitted_size == 100
+
+    # 115 films : ajout incrémental, le vocabulaire reste celui des 100 premiers
+    index = RecommenderIndex.load_or_build(movies_df.iloc[:115], tmp_path)
+    assert len(index) == 115 and index.fitted_size == 100
+    assert RecommenderIndex.load(tmp_path).fitted_size == 100
+
+    # 130 films : 30 % de plus que le dernier apprentissage, l'index est reconstruit
+    index = RecommenderIndex.load_or_build(movies_df, tmp_path)
+    assert len(index) == 130 and index.fitted_size == 130 and index.base_size is None
+
+
+def test_recommend_batch_matches_recommend_positions():
+    movies_df = synthetic_catalog(50)
+    index = RecommenderIndex.build(movies_df)
+    results = recommend_batch(index, movies_df, tmdb_ids=[5, '12', 999], k=4, batch_size=1)
+    assert list(results) == [5, '12']
+    for tmdb_id, (positions, scores) in results.items():
+        expected_positions, expected_scores = recommend_positions(index, int(tmdb_id) - 1, k=4)
+        np.testing.assert_array_equal(positions, expected_positions)
+        np.testing.assert_allclose(scores, expected_scores, rtol=1e-6)
@@ -0,0 +1,51 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'streamlit_home'))
+
+import json
+import time
+import pandas as pd
+
+from recommendation import snapshot
+import util
+
+SOURCE = 'https://example.invalid/df_movie_cleaned.csv'
+
+
+def write_snapshot(directory, checked_at):
+    """Instantané déjà construit pour une source distante, vérifié à checked_at"""
+    pd.DataFrame({'tmdb_id': [1, 2], 'title': ['Alpha', 'Beta']}).to_parquet(os.path.join(directory, 'movies.parquet'), index=False)
+    with open(os.path.join(directory, 'movies.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'format': snapshot.SNAPSHOT_FORMAT_VERSION, 'prepare_version': util.MOVIE_DATA_VERSION, 'source': SOURCE,
+            'etag': '"v1"', 'last_modified': None, 'checked_at': checked_at
+        }, f)
+
+
+def test_later_load_schedules_a_refresh(tmp_path, monkeypatch):
+    refreshes = []
+
+    def fake_refresh(source, prepare, name, directory, prepare_version, meta, on_refresh):
+        refreshes.append(meta['checked_at'])
+        with snapshot._refresh_lock:
+            snapshot._refreshing.discard((name, directory))
+
+    monkeypatch.setattr(snapshot, '_refresh', fake_refresh)
+    monkeypatch.setattr(util, 'SNAPSHOT_DIR', str(tmp_path))
+    util.load_catalog.clear()
+
+    write_snapshot(tmp_path, checked_at=time.time())
+    for _ in range(3):
+        assert util.load_movie_data(SOURCE, columns=['title'])['title'].tolist() == ['Alpha', 'Beta']
+    assert refreshes == []
+
+    # La dernière vérification date de plus de REFRESH_INTERVAL : le chargement suivant la relance
+    stale = time.time() - snapshot.REFRESH_INTERVAL - 1
+    write_snapshot(tmp_path, checked_at=stale)
+    util.load_movie_data(SOURCE, columns=['title'])
+    deadline = time.time() + 5
+    while not refreshes and time.time() < deadline:
+        time.sleep(0.01)
+    assert refreshes == [stale]
+    util.load_catalog.clear()